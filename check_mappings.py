@@ -8,6 +8,12 @@ import sqlite3
 import json
 import sys
 import os
+from sqlalchemy.exc import SQLAlchemyError
+
+# Add the src directory to the Python path
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+from models import PurchasedProductsFieldMapping, session_scope, _bump_mapping_version
 
 def check_mappings():
     """Check all mappings in the database"""
@@ -130,28 +136,16 @@ def check_mappings():
 def fix_purchased_products_mapping():
     """Fix the purchased products mapping by clearing it"""
     
-    # Database path
-    db_path = 'local_app.db'
-    
-    if not os.path.exists(db_path):
-        print(f"❌ Database file not found: {db_path}")
-        return False
-    
     try:
-        # Connect to database
-        conn = sqlite3.connect(db_path)
-        cursor = conn.cursor()
-        
         print("🔧 Fixing purchased products mapping...")
         
-        # Clear the corrupted mapping
-        cursor.execute("DELETE FROM purchased_products_field_mapping")
-        deleted_count = cursor.rowcount
+        # Clear the corrupted mapping and bump its version in one transaction, so
+        # running processes drop their cached copy
+        with session_scope() as session:
+            deleted_count = session.query(PurchasedProductsFieldMapping).delete(synchronize_session=False)
+            _bump_mapping_version(session, f'{PurchasedProductsFieldMapping.__tablename__}_version')
         print(f"   ✅ Deleted {deleted_count} corrupted mapping records")
         
-        # Commit changes
-        conn.commit()
-        
         print("✅ Purchased products mapping has been cleared!")
         print("🔄 Next steps:")
         print("1. Go to the ACGI to HubSpot tab")
@@ -160,15 +154,12 @@ def fix_purchased_products_mapping():
         
         return True
         
-    except sqlite3.Error as e:
+    except SQLAlchemyError as e:
         print(f"❌ Database error: {e}")
         return False
     except Exception as e:
         print(f"❌ Unexpected error: {e}")
         return False
-    finally:
-        if conn:
-            conn.close()
 
 def main():
     """Main function to handle command line arguments"""
@@ -25,6 +25,9 @@ class ExportConfig:
     REQUEST_TIMEOUT = int(os.getenv('EXPORT_TIMEOUT', '60'))
     REQUEST_DELAY = float(os.getenv('EXPORT_DELAY', '0.5'))  # Delay between requests in seconds
     
+    # Checkpoint Settings
+    CHECKPOINT_BATCH_SIZE = int(os.getenv('EXPORT_CHECKPOINT_BATCH_SIZE', '500'))  # Completed IDs per checkpoint commit
+    
     # Output Settings
     OUTPUT_DIRECTORY = os.getenv('EXPORT_OUTPUT_DIR', 'export_scripts')
     INCLUDE_TIMESTAMP = os.getenv('EXPORT_INCLUDE_TIMESTAMP', 'true').lower() == 'true'
@@ -53,6 +56,9 @@ class ExportConfig:
         if cls.BATCH_SIZE < 1 or cls.BATCH_SIZE > 1000:
             errors.append("EXPORT_BATCH_SIZE must be between 1 and 1000")
         
+        if cls.CHECKPOINT_BATCH_SIZE < 1:
+            errors.append("EXPORT_CHECKPOINT_BATCH_SIZE must be >= 1")
+        
         return errors
     
     @classmethod
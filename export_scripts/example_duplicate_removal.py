@@ -37,11 +37,9 @@ def create_sample_csv():
     temp_file = tempfile.NamedTemporaryFile(mode='w', suffix='.csv', delete=False)
     
     fieldnames = ['id', 'name', 'email', 'department']
-    writer = csv.DictWriter(temp_file, fieldnames=fieldnames)
-    writer.writeheader()
-    
-    for row in sample_data:
-        writer.writerow(row)
+    writer = csv.writer(temp_file)
+    writer.writerow(fieldnames)
+    writer.writerows([row[f] for f in fieldnames] for row in sample_data)
     
     temp_file.close()
     return temp_file.name
@@ -153,21 +151,21 @@ def display_csv_preview(file_path: str, title: str, max_rows: int = 10):
     
     try:
         with open(file_path, 'r', newline='', encoding='utf-8') as csvfile:
-            reader = csv.DictReader(csvfile)
-            rows = list(reader)
+            reader = csv.reader(csvfile)
+            headers = next(reader, None)
+            rows = [row for row in reader if row]
             
-            if not rows:
+            if not headers or not rows:
                 print("File is empty")
                 return
             
             # Display headers
-            headers = reader.fieldnames
             print("Headers:", ", ".join(headers))
             print()
             
-            # Display rows
+            # Display rows (only the previewed ones are zipped into dicts)
             for i, row in enumerate(rows[:max_rows]):
-                print(f"Row {i+1}: {dict(row)}")
+                print(f"Row {i+1}: {dict(zip(headers, row))}")
             
             if len(rows) > max_rows:
                 print(f"... and {len(rows) - max_rows} more rows")
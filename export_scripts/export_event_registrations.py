@@ -8,7 +8,6 @@ and fetching event registration data for each customer using the EVTSSAWEBSVCLIB
 
 import os
 import sys
-import time
 from datetime import datetime
 from typing import List, Dict, Any
 from shared_utils import BaseExporter, validate_credentials, get_output_filename, logger
@@ -223,11 +222,14 @@ class EventRegistrationsExporter(BaseExporter):
             return output_file
         
         batch_count = 0
+        registrations_written = 0
+        events_written = 0
         
         for i, customer_id in enumerate(customer_ids, 1):
             logger.info(f"Processing customer {i}/{len(customer_ids)}: {customer_id}")
             
             # Get event registrations for this customer
+            self.rate_limiter.acquire()
             reg_result = self.get_customer_event_registrations(customer_id)
             
             if reg_result['success']:
@@ -237,7 +239,7 @@ class EventRegistrationsExporter(BaseExporter):
                 
                 # Write registrations batch to CSV immediately
                 if registrations:
-                    parsed_registrations = [self.parse_registration_data(registration) for registration in registrations]
+                    parsed_registrations = (self.parse_registration_data(registration) for registration in registrations)
                     registration_fieldnames = [
                         'customerId', 'registrationSerno', 'eventId', 'eventStatus', 'registrationDate',
                         'registrationType', 'registrationName', 'representing', 'billtoId', 'promoCode',
@@ -249,12 +251,13 @@ class EventRegistrationsExporter(BaseExporter):
                         'registrationStreet2', 'registrationStreet3', 'registrationCity', 'registrationState',
                         'registrationZip', 'registrationCountry', 'totalItems', 'totalGuests'
                     ]
-                    self.write_batch_to_csv(parsed_registrations, output_file, registration_fieldnames, is_first_batch=(batch_count == 0))
+                    registrations_written += self.write_batch_to_csv(parsed_registrations, output_file, registration_fieldnames, is_first_batch=(batch_count == 0))
             else:
                 self.total_errors += 1
                 logger.error(f"  Registration error: {reg_result.get('error', 'Unknown error')}")
             
             # Get events for this customer (will be cached to avoid duplicates)
+            self.rate_limiter.acquire()
             events_result = self.get_customer_events(customer_id)
             
             if events_result['success']:
@@ -265,13 +268,10 @@ class EventRegistrationsExporter(BaseExporter):
             
             self.total_processed += 1
             batch_count += 1
-            
-            # Add delay between requests
-            time.sleep(ExportConfig.REQUEST_DELAY)
         
         # Write cached events to CSV (all unique events)
         if self.events_cache:
-            parsed_events = [self.parse_event_data(event) for event in self.events_cache.values()]
+            parsed_events = (self.parse_event_data(event) for event in self.events_cache.values())
             event_fieldnames = [
                 'eventId', 'programName', 'eventName', 'eventType', 'eventTypeDescr',
                 'status', 'startDate', 'endDate', 'deadlineDate', 'requireSecondaryItem',
@@ -279,15 +279,15 @@ class EventRegistrationsExporter(BaseExporter):
                 'locationZip', 'locationCountry', 'locationCountryDescr', 'registerUrl',
                 'registrationStatus', 'lastChangeDate', 'totalAttributes', 'totalRegistrationTypes', 'totalSponsors'
             ]
-            self.write_to_csv(parsed_events, events_output_file, event_fieldnames)
+            events_written = self.write_to_csv(parsed_events, events_output_file, event_fieldnames)
         
         # Print summary
         logger.info("=" * 60)
         logger.info("EXPORT SUMMARY")
         logger.info("=" * 60)
         logger.info(f"Total customer IDs processed: {self.total_processed}")
-        logger.info(f"Event registrations exported: {len(parsed_registrations)}")
-        logger.info(f"Unique events exported: {len(parsed_events)}")
+        logger.info(f"Event registrations exported: {registrations_written}")
+        logger.info(f"Unique events exported: {events_written}")
         logger.info(f"Errors encountered: {self.total_errors}")
         if self.start_time:
             duration = datetime.now() - self.start_time
@@ -331,6 +331,8 @@ def main():
     except Exception as e:
         logger.error(f"Event registrations and events export failed: {str(e)}")
         sys.exit(1)
+    finally:
+        exporter.close()
 
 
 if __name__ == "__main__":
@@ -8,7 +8,6 @@ and fetching event data for each customer using the EVTSSAWEBSVCLIB.GET_EVENT_IN
 
 import os
 import sys
-import time
 from datetime import datetime
 from typing import List, Dict, Any
 from shared_utils import BaseExporter, validate_credentials, get_output_filename, logger
@@ -124,6 +123,7 @@ class EventsExporter(BaseExporter):
             logger.info(f"Processing customer {i}/{len(customer_ids)}: {customer_id}")
             
             # Get events for this customer
+            self.rate_limiter.acquire()
             result = self.get_customer_events(customer_id)
             
             if result['success']:
@@ -133,7 +133,7 @@ class EventsExporter(BaseExporter):
                 
                 # Write events batch to CSV immediately
                 if events:
-                    parsed_events = [self.parse_event_data(event) for event in events]
+                    parsed_events = (self.parse_event_data(event) for event in events)
                     fieldnames = [
                         'customerId', 'eventId', 'programName', 'eventName', 'eventType', 'eventTypeDescr',
                         'status', 'startDate', 'endDate', 'deadlineDate', 'requireSecondaryItem',
@@ -148,9 +148,6 @@ class EventsExporter(BaseExporter):
                 logger.error(f"  Error: {result.get('error', 'Unknown error')}")
             
             self.total_processed += 1
-            
-            # Add delay between requests
-            time.sleep(ExportConfig.REQUEST_DELAY)
         
         
         # Print summary
@@ -188,6 +185,8 @@ def main():
     except Exception as e:
         logger.error(f"Events export failed: {str(e)}")
         sys.exit(1)
+    finally:
+        exporter.close()
 
 
 if __name__ == "__main__":
@@ -8,12 +8,29 @@ and fetching membership data for each customer using the MEMSSAWEBSVCLIB.GET_MEM
 
 import os
 import sys
-import time
 from datetime import datetime
-from typing import List, Dict, Any
-from shared_utils import BaseExporter, validate_credentials, get_output_filename, logger
+from typing import List, Dict, Any, Optional, Sequence
+from shared_utils import BaseExporter, CSVWriterThread, validate_credentials, get_output_filename, get_checkpoint_filename, logger
 from config import ExportConfig
 
+# CSV column -> (ACGI field, default); drives both the rename and the CSV header
+MEMBERSHIP_FIELDS = (
+    ('customerId', 'customerId', ''),
+    ('subgroupId', 'subgroupId', ''),
+    ('subgroupName', 'subgroupName', ''),
+    ('classCode', 'classCd', ''),
+    ('subclassCode', 'subclassCd', ''),
+    ('status', 'status', ''),
+    ('isActive', 'isActive', False),
+    ('joinDate', 'joinDate', ''),
+    ('expireDate', 'expireDate', ''),
+    ('currentStatusReasonCode', 'currentStatusReasonCd', ''),
+    ('currentStatusReasonNote', 'currentStatusReasonNote', ''),
+    ('reinstateDate', 'reinstateDate', ''),
+    ('terminateDate', 'terminateDate', ''),
+)
+MEMBERSHIP_FIELDNAMES = [column for column, _, _ in MEMBERSHIP_FIELDS]
+
 class MembershipsExporter(BaseExporter):
     """Export memberships from ACGI"""
     
@@ -54,6 +71,22 @@ class MembershipsExporter(BaseExporter):
                 'memberships': []
             }
     
+    def get_memberships_batch(self, customer_ids: Sequence[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Get memberships for several customers
+        
+        Args:
+            customer_ids: Customer IDs to fetch memberships for (duplicates are fetched once)
+            
+        Returns:
+            Dictionary mapping each customer ID to its get_customer_memberships result
+        """
+        results = {}
+        for customer_id in dict.fromkeys(customer_ids):
+            self.rate_limiter.acquire()
+            results[customer_id] = self.get_customer_memberships(customer_id)
+        return results
+    
     def parse_membership_data(self, membership: Dict[str, Any]) -> Dict[str, Any]:
         """
         Parse membership data for CSV export
@@ -64,23 +97,11 @@ class MembershipsExporter(BaseExporter):
         Returns:
             Parsed membership data for CSV
         """
-        return {
-            'customerId': membership.get('customerId', ''),
-            'subgroupId': membership.get('subgroupId', ''),
-            'subgroupName': membership.get('subgroupName', ''),
-            'classCode': membership.get('classCd', ''),
-            'subclassCode': membership.get('subclassCd', ''),
-            'status': membership.get('status', ''),
-            'isActive': membership.get('isActive', False),
-            'joinDate': membership.get('joinDate', ''),
-            'expireDate': membership.get('expireDate', ''),
-            'currentStatusReasonCode': membership.get('currentStatusReasonCd', ''),
-            'currentStatusReasonNote': membership.get('currentStatusReasonNote', ''),
-            'reinstateDate': membership.get('reinstateDate', ''),
-            'terminateDate': membership.get('terminateDate', '')
-        }
+        get = membership.get
+        return {column: get(source, default) for column, source, default in MEMBERSHIP_FIELDS}
     
-    def export_memberships_to_csv(self, csv_file_path: str, id_column: str = 'custId', output_file: str = None) -> str:
+    def export_memberships_to_csv(self, csv_file_path: str, id_column: str = 'custId', output_file: str = None,
+                                  checkpoint_file: Optional[str] = None, resume: bool = False) -> str:
         """
         Export memberships to CSV
         
@@ -88,6 +109,9 @@ class MembershipsExporter(BaseExporter):
             csv_file_path: Path to CSV file containing customer IDs
             id_column: Name of the column containing customer IDs
             output_file: Optional output file path
+            checkpoint_file: Optional sqlite checkpoint path; it is deleted once the
+                export finishes without errors
+            resume: Skip the customers recorded in checkpoint_file and append to output_file
             
         Returns:
             Path to the created CSV file
@@ -106,37 +130,59 @@ class MembershipsExporter(BaseExporter):
             logger.warning("No customer IDs found in CSV file")
             return output_file
         
-        batch_count = 0
+        # Each customer only needs to be fetched once
+        customer_ids = list(dict.fromkeys(customer_ids))
         
-        for i, customer_id in enumerate(customer_ids, 1):
-            logger.info(f"Processing customer {i}/{len(customer_ids)}: {customer_id}")
-            
-            # Get memberships for this customer
-            result = self.get_customer_memberships(customer_id)
-            
-            if result['success']:
-                memberships = result['memberships']
-                self.total_exported += len(memberships)
-                logger.info(f"  Found {len(memberships)} memberships")
+        done_ids = set()
+        if checkpoint_file:
+            source = f"{os.path.abspath(csv_file_path)}:{id_column}"
+            done_ids = self.open_checkpoint(checkpoint_file, source, resume=resume)
+        if done_ids:
+            customer_ids = [customer_id for customer_id in customer_ids if customer_id not in done_ids]
+            logger.info(f"{len(customer_ids)} customer IDs remaining after checkpoint")
+        
+        batch_size = ExportConfig.BATCH_SIZE
+        
+        # When resuming, append to the rows written by the previous run
+        self.csv_writer = CSVWriterThread(output_file, MEMBERSHIP_FIELDNAMES, append=bool(done_ids))
+        self.csv_writer.start()
+        
+        try:
+            for start in range(0, len(customer_ids), batch_size):
+                batch_ids = customer_ids[start:start + batch_size]
+                logger.info(f"Fetching memberships for customers {start + 1}-{start + len(batch_ids)}/{len(customer_ids)}")
+                results = self.get_memberships_batch(batch_ids)
                 
-                # Write memberships batch to CSV immediately
-                if memberships:
-                    parsed_memberships = [self.parse_membership_data(membership) for membership in memberships]
-                    fieldnames = [
-                        'customerId', 'subgroupId', 'subgroupName', 'classCode', 'subclassCode',
-                        'status', 'isActive', 'joinDate', 'expireDate', 'currentStatusReasonCode',
-                        'currentStatusReasonNote', 'reinstateDate', 'terminateDate'
-                    ]
-                    self.write_batch_to_csv(parsed_memberships, output_file, fieldnames, is_first_batch=(batch_count == 0))
-                    batch_count += 1
+                for customer_id in batch_ids:
+                    result = results[customer_id]
+                    
+                    if result['success']:
+                        memberships = result['memberships']
+                        self.total_exported += len(memberships)
+                        logger.info(f"  Customer {customer_id}: found {len(memberships)} memberships")
+                        
+                        if memberships:
+                            self.csv_writer.put([self.parse_membership_data(membership) for membership in memberships])
+                        
+                        self.mark_customer_done(customer_id, len(memberships))
+                    else:
+                        self.total_errors += 1
+                        logger.error(f"  Customer {customer_id}: {result.get('error', 'Unknown error')}")
+                    
+                    self.total_processed += 1
+        finally:
+            try:
+                # Drains the writer before committing the last checkpoint rows
+                self.close_checkpoint()
+            finally:
+                self.csv_writer.close()
+                self.csv_writer = None
+        
+        if checkpoint_file:
+            if self.total_errors:
+                logger.info(f"Keeping checkpoint {checkpoint_file}; rerun with --resume to retry failed customers")
             else:
-                self.total_errors += 1
-                logger.error(f"  Error: {result.get('error', 'Unknown error')}")
-            
-            self.total_processed += 1
-            
-            # Add delay between requests
-            time.sleep(ExportConfig.REQUEST_DELAY)
+                self.remove_checkpoint(checkpoint_file)
         
         # Print summary
         self.print_summary("Memberships")
@@ -151,9 +197,16 @@ def main():
     parser = argparse.ArgumentParser(description='Export ACGI Memberships to CSV')
     parser.add_argument('csv_file', help='Path to CSV file containing customer IDs')
     parser.add_argument('--id-column', default='custId', help='Name of the column containing customer IDs (default: custId)')
-    parser.add_argument('--output', help='Output CSV file path')
+    parser.add_argument('--output', help='Output CSV file path (reuse the same path when resuming)')
+    parser.add_argument('--checkpoint', help='Checkpoint database path (default: <output>_ckpt.db next to the output file)')
+    parser.add_argument('--no-checkpoint', action='store_true', help='Disable the resume checkpoint')
+    parser.add_argument('--resume', action='store_true', help='Resume an interrupted export (requires --output)')
     
     args = parser.parse_args()
+    if args.resume and (args.no_checkpoint or not args.output):
+        parser.error('--resume requires --output and a checkpoint')
+    
+    output_file = args.output or get_output_filename('memberships')
     
     # Validate credentials
     credentials = validate_credentials()
@@ -165,7 +218,9 @@ def main():
         output_file = exporter.export_memberships_to_csv(
             csv_file_path=args.csv_file,
             id_column=args.id_column,
-            output_file=args.output
+            output_file=output_file,
+            checkpoint_file=None if args.no_checkpoint else (args.checkpoint or get_checkpoint_filename(output_file)),
+            resume=args.resume
         )
         logger.info(f"Memberships export completed successfully: {output_file}")
     except KeyboardInterrupt:
@@ -173,6 +228,8 @@ def main():
     except Exception as e:
         logger.error(f"Memberships export failed: {str(e)}")
         sys.exit(1)
+    finally:
+        exporter.close()
 
 
 if __name__ == "__main__":
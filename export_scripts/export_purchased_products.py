@@ -8,7 +8,6 @@ and fetching purchased products data for each customer using the ECSSAWEBSVCLIB.
 
 import os
 import sys
-import time
 from datetime import datetime
 from typing import List, Dict, Any
 from shared_utils import BaseExporter, validate_credentials, get_output_filename, logger
@@ -122,6 +121,7 @@ class PurchasedProductsExporter(BaseExporter):
             logger.info(f"Processing customer {i}/{len(customer_ids)}: {customer_id}")
             
             # Get purchased products for this customer
+            self.rate_limiter.acquire()
             result = self.get_customer_purchased_products(customer_id)
             
             if result['success']:
@@ -131,7 +131,7 @@ class PurchasedProductsExporter(BaseExporter):
                 
                 # Write products batch to CSV immediately
                 if products:
-                    parsed_products = [self.parse_purchased_product_data(product) for product in products]
+                    parsed_products = (self.parse_purchased_product_data(product) for product in products)
                     fieldnames = [
                         'customerId', 'productSerno', 'productId', 'productName', 'length', 'width',
                         'height', 'weight', 'activeFlag', 'internalOrderFlag', 'firstAvailableDate',
@@ -146,9 +146,6 @@ class PurchasedProductsExporter(BaseExporter):
                 logger.error(f"  Error: {result.get('error', 'Unknown error')}")
             
             self.total_processed += 1
-            
-            # Add delay between requests
-            time.sleep(ExportConfig.REQUEST_DELAY)
         
         
         # Print summary
@@ -186,6 +183,8 @@ def main():
     except Exception as e:
         logger.error(f"Purchased products export failed: {str(e)}")
         sys.exit(1)
+    finally:
+        exporter.close()
 
 
 if __name__ == "__main__":
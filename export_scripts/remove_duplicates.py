@@ -12,11 +12,21 @@ Usage:
 import os
 import sys
 import csv
+import hashlib
 import argparse
+from collections import Counter
+import glob
+import heapq
 import logging
+import math
+import mmap
+import re
+import shutil
+import tempfile
 from datetime import datetime
-from typing import List, Dict, Any, Set
-from collections import OrderedDict
+from multiprocessing import Pool
+from operator import itemgetter
+from typing import Callable, Dict, Hashable, List, Optional, Set, Tuple
 
 # Add current directory to Python path
 sys.path.insert(0, os.path.dirname(__file__))
@@ -26,12 +36,118 @@ logging.basicConfig(
     level=logging.INFO,
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
     handlers=[
-        logging.FileHandler('duplicate_removal.log'),
+        # delay: don't create the log file until something is logged
+        logging.FileHandler('duplicate_removal.log', delay=True),
         logging.StreamHandler()
     ]
 )
 logger = logging.getLogger(__name__)
 
+# Integer-like keys below this bound are tracked in a bitvector (one bit per id)
+# instead of a set; 10M ids cost 1.25 MB
+BITVECTOR_MAX_ID = 10_000_000
+# Without a leading zero, every value this short is below BITVECTOR_MAX_ID and
+# maps to exactly one id ('7' and '007' must stay distinct)
+BITVECTOR_MAX_DIGITS = len(str(BITVECTOR_MAX_ID - 1))
+BITVECTOR_SAMPLE_ROWS = 1000
+
+# Leading column added to shard files so the merge can restore input order
+SHARD_ROW_COLUMN = '__row_number'
+
+# Case-insensitive keys memoize raw -> normalized values up to this many entries
+NORMALIZE_CACHE_SIZE = 1_000_000
+
+# Target false-positive rate of the optional Bloom prefilter (about 19 bits per row)
+BLOOM_ERROR_RATE = 1e-4
+
+# Progress is logged every this many rows, so huge files show signs of life
+# without a log record per row
+PROGRESS_EVERY = 100_000
+
+# 1 MiB file buffers: the keep-first loop is cheap enough that 8 KiB reads/writes
+# make it syscall-bound
+IO_BUFFER_SIZE = 1 << 20
+
+# Kept rows are handed to csv.writer.writerows in batches of this size
+WRITE_BATCH_ROWS = 4096
+
+# Allow long free-text fields; the default 128 KiB limit aborts on large notes columns
+csv.field_size_limit(min(sys.maxsize, 2 ** 31 - 1))
+
+
+def _caching_normalizer(limit: int = NORMALIZE_CACHE_SIZE) -> Callable[[str], str]:
+    """
+    Return a value -> value.strip().lower() function that memoizes its results
+    
+    Columns worth deduplicating repeat values, so most calls become one dict
+    lookup; the cache stops growing at limit entries on pathological input.
+    """
+    cache: Dict[str, str] = {}
+    get = cache.get
+    
+    def normalize(value):
+        result = get(value)
+        if result is None:
+            result = value.strip().lower()
+            if len(cache) < limit:
+                cache[value] = result
+        return result
+    
+    return normalize
+
+
+def _key_bytes(key: Hashable) -> bytes:
+    """Encode a dedupe key (str, tuple of str, or hash) as bytes"""
+    if isinstance(key, int):
+        return key.to_bytes(8, 'little', signed=True)
+    if isinstance(key, tuple):
+        return '\x1f'.join(key).encode('utf-8')
+    return key.encode('utf-8')
+
+
+def _fit_row(row: List[str], width: int) -> List[str]:
+    """Pad a short row with '' or drop extra fields so it has exactly width fields"""
+    if len(row) < width:
+        return row + [''] * (width - len(row))
+    return row[:width]
+
+
+def _advise_sequential(fd: int, mm: Optional[mmap.mmap] = None):
+    """
+    Tell the kernel a file will be read front to back, so it reads ahead aggressively
+    
+    Only matters on a cold page cache; where the hints don't exist (non-Linux) this is a no-op.
+    """
+    if hasattr(os, 'posix_fadvise'):
+        os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_SEQUENTIAL)
+    if mm is not None and hasattr(mmap, 'MADV_SEQUENTIAL'):
+        mm.madvise(mmap.MADV_SEQUENTIAL)
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over bytes, with k indexes double-hashed from one blake2b digest"""
+    
+    def __init__(self, capacity: int, error_rate: float = BLOOM_ERROR_RATE):
+        capacity = max(1, capacity)
+        self.size = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) >> 3)
+    
+    def add(self, data: bytes) -> bool:
+        """Add data; return True if it may have been added before"""
+        digest = hashlib.blake2b(data, digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        bits, size = self.bits, self.size
+        present = True
+        for i in range(self.hash_count):
+            n = (h1 + i * h2) % size
+            byte, bit = n >> 3, 1 << (n & 7)
+            if not bits[byte] & bit:
+                present = False
+                bits[byte] |= bit
+        return present
+
 
 class DuplicateRemover:
     """Remove duplicates from CSV files based on a specified column"""
@@ -43,16 +159,26 @@ class DuplicateRemover:
         self.start_time = None
     
     def remove_duplicates(self, input_file: str, output_file: str, column: str, 
-                         keep_first: bool = True, case_sensitive: bool = True) -> bool:
+                         keep_first: bool = True, case_sensitive: bool = True,
+                         hash_keys: bool = False, bloom_prefilter: bool = False) -> bool:
         """
         Remove duplicates from CSV file based on specified column
         
+        Rows are streamed from input to output, so memory use is bounded by
+        the number of unique values rather than the size of the file.
+        
         Args:
             input_file: Path to input CSV file
             output_file: Path to output CSV file
-            column: Column name to check for duplicates
+            column: Column name to check for duplicates, or a comma-separated list
+                of columns whose combined values form the key
             keep_first: If True, keep first occurrence; if False, keep last occurrence
             case_sensitive: If True, treat values case-sensitively
+            hash_keys: If True, track 64-bit hashes instead of the values themselves
+                (much less memory for long values; collisions are negligible at CSV scale)
+            bloom_prefilter: If True, first find candidate duplicate keys with a Bloom
+                filter and track only those exactly (an extra pass, far less memory
+                when most values are unique)
             
         Returns:
             True if successful, False otherwise
@@ -65,28 +191,66 @@ class DuplicateRemover:
                 logger.error(f"Input file not found: {input_file}")
                 return False
             
-            # Read CSV and validate column exists
-            rows_data, fieldnames = self._read_csv(input_file)
-            if not rows_data:
-                logger.error("No data found in input file")
-                return False
+            with open(input_file, 'r', newline='', encoding='utf-8',
+                      buffering=IO_BUFFER_SIZE) as infile:
+                _advise_sequential(infile.fileno())
+                reader = csv.reader(infile)
+                fieldnames = next(reader, None)
+                
+                if not fieldnames:
+                    logger.error("CSV file has no headers")
+                    logger.error("No data found in input file")
+                    return False
+                
+                col_idxs = self._resolve_columns(column, fieldnames)
+                if col_idxs is None:
+                    return False
+                
+                logger.info(f"Processing rows from {input_file}")
+                logger.info(f"Removing duplicates based on column: {column}")
+                logger.info(f"Keep {'first' if keep_first else 'last'} occurrence of duplicates")
+                logger.info(f"Case sensitive: {case_sensitive}")
+                
+                key = self._key_function(col_idxs, case_sensitive, hash_keys)
+                
+                # The bitvector only speeds up keep-first; keep-last works from a mask
+                int_col_idx = None
+                if keep_first and len(col_idxs) == 1:
+                    if self._is_integer_column(reader, col_idxs[0]):
+                        logger.info("Column looks numeric - tracking ids in a bitvector")
+                        int_col_idx = col_idxs[0]
+                    reader = self._rewind(infile)
+                
+                candidates = None
+                if bloom_prefilter and int_col_idx is None:
+                    candidates = self._find_duplicate_candidates(
+                        reader, key, self._estimate_row_count(input_file))
+                    reader = self._rewind(infile)
+                elif bloom_prefilter:
+                    logger.info("Numeric column already uses a bitvector - Bloom prefilter skipped")
+                
+                written = False
+                if len(col_idxs) == 1 and candidates is None:
+                    # Unquoted files skip the csv state machine entirely
+                    written = self._write_unique_lines(input_file, col_idxs[0], keep_first,
+                                                       case_sensitive, hash_keys, int_col_idx,
+                                                       output_file)
+                if not written:
+                    keep_mask = None
+                    if not keep_first:
+                        # First pass: only the key column is inspected to build a keep-mask
+                        keep_mask = self._build_keep_last_mask(reader, key, candidates)
+                        reader = self._rewind(infile)
+                    
+                    self._write_unique_rows(reader, fieldnames, key, output_file, keep_mask,
+                                            int_col_idx, candidates)
             
-            if column not in fieldnames:
-                logger.error(f"Column '{column}' not found in CSV. Available columns: {fieldnames}")
+            if self.total_rows == 0:
+                logger.error("No data found in input file")
                 return False
             
-            logger.info(f"Processing {len(rows_data)} rows from {input_file}")
-            logger.info(f"Removing duplicates based on column: {column}")
-            logger.info(f"Keep {'first' if keep_first else 'last'} occurrence of duplicates")
-            logger.info(f"Case sensitive: {case_sensitive}")
-            
-            # Remove duplicates
-            unique_rows = self._remove_duplicates_from_data(
-                rows_data, column, keep_first, case_sensitive
-            )
-            
-            # Write output file
-            self._write_csv(unique_rows, fieldnames, output_file)
+            logger.info(f"Found {self.duplicate_rows} duplicate rows")
+            logger.info(f"Kept {self.unique_rows} unique rows")
             
             # Print summary
             self._print_summary(input_file, output_file)
@@ -97,99 +261,817 @@ class DuplicateRemover:
             logger.error(f"Error processing file: {str(e)}")
             return False
     
-    def _read_csv(self, file_path: str) -> tuple[List[Dict[str, Any]], List[str]]:
-        """Read CSV file and return rows data and fieldnames"""
-        rows_data = []
-        fieldnames = []
+    def collect_stats(self, input_file: str, column: str, case_sensitive: bool = True,
+                      top: int = 20) -> bool:
+        """
+        Count duplicates without writing anything, and log the most repeated values
         
+        Args:
+            input_file: Path to input CSV file
+            column: Column name (or comma-separated column names) to check
+            case_sensitive: If True, treat values case-sensitively
+            top: Number of most repeated values to report
+            
+        Returns:
+            True if successful, False otherwise
+        """
         try:
-            with open(file_path, 'r', newline='', encoding='utf-8') as csvfile:
-                reader = csv.DictReader(csvfile)
-                fieldnames = reader.fieldnames
+            if not os.path.exists(input_file):
+                logger.error(f"Input file not found: {input_file}")
+                return False
+            
+            with open(input_file, 'r', newline='', encoding='utf-8',
+                      buffering=IO_BUFFER_SIZE) as infile:
+                _advise_sequential(infile.fileno())
+                reader = csv.reader(infile)
+                fieldnames = next(reader, None)
                 
                 if not fieldnames:
                     logger.error("CSV file has no headers")
-                    return [], []
-                
-                for row in reader:
-                    rows_data.append(row)
+                    return False
                 
-                logger.info(f"Successfully read {len(rows_data)} rows from {file_path}")
-                return rows_data, fieldnames
+                col_idxs = self._resolve_columns(column, fieldnames)
+                if col_idxs is None:
+                    return False
                 
+                key = self._key_function(col_idxs, case_sensitive)
+                # Counter tallies an iterable with its C helper
+                counts = Counter(key(row) for row in reader if row)
+            
+            self.total_rows = sum(counts.values())
+            self.unique_rows = len(counts)
+            self.duplicate_rows = self.total_rows - self.unique_rows
+            repeated = sum(1 for n in counts.values() if n > 1)
+            
+            logger.info("=" * 60)
+            logger.info("DUPLICATE STATISTICS")
+            logger.info("=" * 60)
+            logger.info(f"Input file: {input_file}")
+            logger.info(f"Column: {column} (case sensitive: {case_sensitive})")
+            logger.info(f"Total rows: {self.total_rows}")
+            logger.info(f"Distinct values: {self.unique_rows}")
+            logger.info(f"Values that repeat: {repeated}")
+            logger.info(f"Duplicate rows that would be removed: {self.duplicate_rows}")
+            if repeated:
+                logger.info(f"Most repeated values (top {top}):")
+                for value, n in counts.most_common(top):
+                    if n < 2:
+                        break
+                    logger.info(f"  {n:>8}  {value!r}")
+            logger.info("=" * 60)
+            return True
+            
         except Exception as e:
-            logger.error(f"Error reading CSV file: {str(e)}")
-            return [], []
-    
-    def _remove_duplicates_from_data(self, rows_data: List[Dict[str, Any]], 
-                                   column: str, keep_first: bool, 
-                                   case_sensitive: bool) -> List[Dict[str, Any]]:
-        """Remove duplicates from rows data based on specified column"""
-        seen_values: Set[str] = set()
-        unique_rows = []
-        
-        # Use OrderedDict to maintain order while tracking duplicates
-        if keep_first:
-            # Process rows in order, keeping first occurrence
-            for row in rows_data:
-                value = str(row.get(column, '')).strip()
-                
-                if not case_sensitive:
-                    value = value.lower()
+            logger.error(f"Error processing file: {str(e)}")
+            return False
+    
+    def remove_duplicates_sharded(self, input_file: str, output_file: str, column: str,
+                                  shards: int, jobs: Optional[int] = None,
+                                  keep_first: bool = True, case_sensitive: bool = True,
+                                  hash_keys: bool = False) -> bool:
+        """
+        Remove duplicates from one large CSV file using several processes
+        
+        Rows are split into shards by a hash of their key, so equal keys always
+        land in the same shard; the shards are deduplicated in parallel and then
+        merged back in input order. The output is identical to remove_duplicates().
+        
+        Args:
+            input_file: Path to input CSV file
+            output_file: Path to output CSV file
+            column: Column name to check for duplicates
+            shards: Number of shards to split the input into
+            jobs: Worker processes (default: one per shard)
+            keep_first: If True, keep first occurrence; if False, keep last occurrence
+            case_sensitive: If True, treat values case-sensitively
+            hash_keys: If True, track 64-bit hashes instead of the values themselves
+            
+        Returns:
+            True if successful, False otherwise
+        """
+        self.start_time = datetime.now()
+        
+        if not os.path.exists(input_file):
+            logger.error(f"Input file not found: {input_file}")
+            return False
+        
+        output_dir = os.path.dirname(output_file)
+        if output_dir:
+            os.makedirs(output_dir, exist_ok=True)
+        shard_dir = tempfile.mkdtemp(prefix='dedupe_shards_', dir=output_dir or None)
+        
+        try:
+            shard_files = [os.path.join(shard_dir, f"shard_{k}.csv") for k in range(shards)]
+            fieldnames = self._split_into_shards(input_file, column, case_sensitive, shard_files)
+            if fieldnames is None:
+                return False
+            
+            if self.total_rows == 0:
+                logger.error("No data found in input file")
+                return False
+            
+            # Empty shards have nothing to deduplicate (and would report "no data")
+            shard_files = [shard for shard in shard_files if os.path.getsize(shard) > 0]
+            workers = max(1, min(jobs or shards, len(shard_files)))
+            logger.info(f"Deduplicating {len(shard_files)} shards with {workers} worker(s)")
+            tasks = [(shard, f"{shard}.out", column, keep_first, case_sensitive, hash_keys)
+                     for shard in shard_files]
+            with Pool(workers) as pool:
+                results = pool.map(_dedupe_file_star, tasks)
+            
+            failed = [shard for shard, success in results if not success]
+            if failed:
+                logger.error(f"Failed to deduplicate shards: {failed}")
+                return False
+            
+            self._merge_shards([f"{shard}.out" for shard in shard_files], fieldnames, output_file)
+            
+            logger.info(f"Found {self.duplicate_rows} duplicate rows")
+            logger.info(f"Kept {self.unique_rows} unique rows")
+            self._print_summary(input_file, output_file)
+            return True
+            
+        except Exception as e:
+            logger.error(f"Error processing file: {str(e)}")
+            return False
+        finally:
+            shutil.rmtree(shard_dir, ignore_errors=True)
+    
+    def remove_duplicates_chunked(self, input_file: str, output_file: str, column: str,
+                                  chunks: int, jobs: Optional[int] = None,
+                                  keep_first: bool = True, case_sensitive: bool = True,
+                                  hash_keys: bool = False) -> bool:
+        """
+        Remove duplicates from one large unquoted CSV file using several processes
+        
+        The data is cut into byte ranges at line boundaries with no splitting
+        pass: each worker maps the input, deduplicates its own range and writes
+        the rows it kept. A serial merge then walks those outputs in input order
+        with one global seen set, so only rows that survived a chunk are looked
+        at twice. Files the line-based reader can't handle (quotes, bare CRs,
+        rows of another width), composite keys and keep-last go through
+        remove_duplicates_sharded().
+        
+        Args:
+            input_file: Path to input CSV file
+            output_file: Path to output CSV file
+            column: Column name to check for duplicates
+            chunks: Number of byte ranges to split the input into
+            jobs: Worker processes (default: one per chunk)
+            keep_first: If True, keep first occurrence; if False, keep last occurrence
+            case_sensitive: If True, treat values case-sensitively
+            hash_keys: If True, track 64-bit hashes instead of the values themselves
+            
+        Returns:
+            True if successful, False otherwise
+        """
+        self.start_time = datetime.now()
+        
+        if not os.path.exists(input_file):
+            logger.error(f"Input file not found: {input_file}")
+            return False
+        
+        try:
+            with open(input_file, 'rb') as f:
+                if os.fstat(f.fileno()).st_size == 0:
+                    logger.error("CSV file has no headers")
+                    return False
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    header = mm.readline()
+                    fieldnames = header.rstrip(b'\r\n').decode('utf-8').split(',')
+                    col_idxs = self._resolve_columns(column, fieldnames)
+                    if col_idxs is None:
+                        return False
+                    line_based = (keep_first and len(col_idxs) == 1 and mm.find(b'"') == -1
+                                  and not re.search(rb'\r(?!\n)', mm))
+                    
+                    # Range starts: evenly spaced offsets, each moved past the next newline
+                    data_start, size = mm.tell(), len(mm)
+                    step = max(1, (size - data_start) // chunks)
+                    starts = [data_start]
+                    for k in range(1, chunks):
+                        newline = mm.find(b'\n', max(data_start + k * step, starts[-1]))
+                        if newline == -1 or newline + 1 >= size:
+                            break
+                        starts.append(newline + 1)
+        except Exception as e:
+            logger.error(f"Error processing file: {str(e)}")
+            return False
+        
+        if not line_based:
+            logger.info("Input needs the csv reader, keep-last or a composite key - using hash shards")
+            return self.remove_duplicates_sharded(input_file, output_file, column, chunks, jobs,
+                                                  keep_first, case_sensitive, hash_keys)
+        
+        output_dir = os.path.dirname(output_file)
+        if output_dir:
+            os.makedirs(output_dir, exist_ok=True)
+        chunk_dir = tempfile.mkdtemp(prefix='dedupe_chunks_', dir=output_dir or None)
+        tmp_file = f"{output_file}.tmp"
+        
+        try:
+            ranges = list(zip(starts, starts[1:] + [size]))
+            tasks = [(input_file, start, end, col_idxs[0], case_sensitive, hash_keys,
+                      len(fieldnames) - 1, os.path.join(chunk_dir, f"chunk_{k}.csv"))
+                     for k, (start, end) in enumerate(ranges)]
+            workers = max(1, min(jobs or len(tasks), len(tasks)))
+            logger.info(f"Deduplicating {len(tasks)} chunks with {workers} worker(s)")
+            with Pool(workers) as pool:
+                results = pool.map(_dedupe_byte_range_star, tasks)
+            
+            if any(chunk_total < 0 for _, chunk_total in results):
+                logger.info("Rows don't all match the header's field count - using hash shards")
+                return self.remove_duplicates_sharded(input_file, output_file, column, chunks, jobs,
+                                                      keep_first, case_sensitive, hash_keys)
+            
+            total = sum(chunk_total for _, chunk_total in results)
+            if total == 0:
+                logger.error("No data found in input file")
+                return False
+            
+            # Merge in input order: a row survives if no earlier chunk kept its key
+            value_key = self._value_key_function(case_sensitive, hash_keys)
+            col_idx = col_idxs[0]
+            kept = 0
+            seen_values: Set[Hashable] = set()
+            seen_add = seen_values.add
+            with open(tmp_file, 'wb', buffering=IO_BUFFER_SIZE) as out:
+                write = out.write
+                write(header.rstrip(b'\r\n') + b'\r\n')
+                for chunk_output, _ in results:
+                    with open(chunk_output, 'rb', buffering=IO_BUFFER_SIZE) as chunk:
+                        for line in chunk:
+                            # Chunk outputs always end lines with CRLF
+                            fields = line[:-2].split(b',', col_idx + 1)
+                            raw = fields[col_idx].decode('utf-8') if col_idx < len(fields) else ''
+                            seen_add(value_key(raw))
+                            if len(seen_values) > kept:
+                                write(line)
+                                kept += 1
+            
+            os.replace(tmp_file, output_file)
+            self.total_rows = total
+            self.unique_rows = kept
+            self.duplicate_rows = total - kept
+            logger.info(f"Successfully wrote {self.unique_rows} rows to {output_file}")
+            
+            logger.info(f"Found {self.duplicate_rows} duplicate rows")
+            logger.info(f"Kept {self.unique_rows} unique rows")
+            self._print_summary(input_file, output_file)
+            return True
+            
+        except Exception as e:
+            logger.error(f"Error processing file: {str(e)}")
+            return False
+        finally:
+            if os.path.exists(tmp_file):
+                os.unlink(tmp_file)
+            shutil.rmtree(chunk_dir, ignore_errors=True)
+    
+    def _split_into_shards(self, input_file: str, column: str, case_sensitive: bool,
+                           shard_files: List[str]) -> Optional[List[str]]:
+        """
+        Write each row to shard hash(key) % len(shard_files), prefixed with its row number
+        
+        Returns:
+            The input's fieldnames, or None if the input can't be processed
+        """
+        with open(input_file, 'r', newline='', encoding='utf-8',
+                  buffering=IO_BUFFER_SIZE) as infile:
+            _advise_sequential(infile.fileno())
+            reader = csv.reader(infile)
+            fieldnames = next(reader, None)
+            
+            if not fieldnames:
+                logger.error("CSV file has no headers")
+                logger.error("No data found in input file")
+                return None
+            
+            col_idxs = self._resolve_columns(column, fieldnames)
+            if col_idxs is None:
+                return None
+            
+            key = self._key_function(col_idxs, case_sensitive)
+            # A deterministic digest (unlike hash()) so shard choice doesn't depend on the process
+            blake2b = hashlib.blake2b
+            shard_count = len(shard_files)
+            
+            header = [SHARD_ROW_COLUMN] + fieldnames
+            shard_used = [False] * shard_count
+            total = 0
+            
+            handles = [open(path, 'w', newline='', encoding='utf-8',
+                            buffering=IO_BUFFER_SIZE) for path in shard_files]
+            try:
+                writers = [csv.writer(handle) for handle in handles]
+                for row_number, row in enumerate(reader):
+                    if row:
+                        total += 1
+                        if not total % PROGRESS_EVERY:
+                            logger.info(f"Split {total:,} rows into shards")
+                        digest = blake2b(_key_bytes(key(row)), digest_size=8).digest()
+                        shard = int.from_bytes(digest, 'little') % shard_count
+                        # Header is written lazily so untouched shards stay empty files
+                        if not shard_used[shard]:
+                            writers[shard].writerow(header)
+                            shard_used[shard] = True
+                        writers[shard].writerow([row_number] + row)
+            finally:
+                for handle in handles:
+                    handle.close()
+        
+        self.total_rows = total
+        return fieldnames
+    
+    def _merge_shards(self, shard_outputs: List[str], fieldnames: List[str], output_file: str):
+        """Merge deduplicated shards (each already in row order) into output_file in input order"""
+        tmp_file = f"{output_file}.tmp"
+        handles = [open(path, 'r', newline='', encoding='utf-8',
+                        buffering=IO_BUFFER_SIZE) for path in shard_outputs]
+        kept = 0
+        try:
+            readers = []
+            for handle in handles:
+                reader = csv.reader(handle)
+                next(reader)
+                readers.append(reader)
+            
+            with open(tmp_file, 'w', newline='', encoding='utf-8',
+                      buffering=IO_BUFFER_SIZE) as csvfile:
+                writer = csv.writer(csvfile)
+                writer.writerow(fieldnames)
+                writerow = writer.writerow
+                width = len(fieldnames)
+                for row in heapq.merge(*readers, key=lambda r: int(r[0])):
+                    writerow(_fit_row(row[1:], width))
+                    kept += 1
+            
+            os.replace(tmp_file, output_file)
+        except Exception:
+            if os.path.exists(tmp_file):
+                os.unlink(tmp_file)
+            raise
+        finally:
+            for handle in handles:
+                handle.close()
+        
+        self.unique_rows = kept
+        self.duplicate_rows = self.total_rows - kept
+        logger.info(f"Successfully wrote {kept} rows to {output_file}")
+    
+    @staticmethod
+    def _resolve_columns(column: str, fieldnames: List[str]) -> Optional[List[int]]:
+        """
+        Map a column name (or comma-separated column names) to header indexes
+        
+        Returns:
+            List of column indexes, or None if any column is missing
+        """
+        # A header that itself contains a comma still works as a single column
+        columns = [column] if column in fieldnames else [c.strip() for c in column.split(',')]
+        missing = [c for c in columns if c not in fieldnames]
+        if missing:
+            logger.error(f"Column '{', '.join(missing)}' not found in CSV. Available columns: {fieldnames}")
+            return None
+        return [fieldnames.index(c) for c in columns]
+    
+    @staticmethod
+    def _key_function(col_idxs: List[int], case_sensitive: bool, hash_keys: bool = False):
+        """
+        Build the row -> normalized key function once, outside the hot loops
+        
+        A single column keys on its string; several columns key on a tuple of
+        their values, which hashes without building a joined string.
+        """
+        if len(col_idxs) == 1:
+            col_idx = col_idxs[0]
+            if case_sensitive:
+                def key(row):
+                    return row[col_idx].strip() if col_idx < len(row) else ''
+            else:
+                normalize = _caching_normalizer()
                 
-                if value not in seen_values:
-                    seen_values.add(value)
-                    unique_rows.append(row)
-                else:
-                    self.duplicate_rows += 1
+                def key(row):
+                    return normalize(row[col_idx]) if col_idx < len(row) else ''
         else:
-            # Process rows in reverse order, keeping last occurrence
-            for row in reversed(rows_data):
-                value = str(row.get(column, '')).strip()
-                
-                if not case_sensitive:
-                    value = value.lower()
+            get = itemgetter(*col_idxs)
+            width = max(col_idxs) + 1
+            if case_sensitive:
+                def key(row):
+                    if len(row) < width:
+                        row = row + [''] * (width - len(row))
+                    return tuple([value.strip() for value in get(row)])
+            else:
+                normalize = _caching_normalizer()
                 
-                if value not in seen_values:
-                    seen_values.add(value)
-                    unique_rows.insert(0, row)  # Insert at beginning to maintain order
-                else:
-                    self.duplicate_rows += 1
+                def key(row):
+                    if len(row) < width:
+                        row = row + [''] * (width - len(row))
+                    return tuple([normalize(value) for value in get(row)])
+        
+        if not hash_keys:
+            return key
+        
+        # The set would hash the key anyway (str caches it); keeping only that
+        # 64-bit int lets the value itself be freed, and ints hash for free
+        def hashed_key(row):
+            return hash(key(row))
         
-        self.total_rows = len(rows_data)
-        self.unique_rows = len(unique_rows)
+        return hashed_key
+    
+    @staticmethod
+    def _value_key_function(case_sensitive: bool, hash_keys: bool = False):
+        """Single-column counterpart of _key_function that takes the raw field value"""
+        if case_sensitive:
+            normalize = str.strip
+        else:
+            normalize = _caching_normalizer()
         
-        logger.info(f"Found {self.duplicate_rows} duplicate rows")
-        logger.info(f"Kept {self.unique_rows} unique rows")
+        if not hash_keys:
+            return normalize
         
-        return unique_rows
+        def hashed_key(value):
+            return hash(normalize(value))
+        
+        return hashed_key
+    
+    @staticmethod
+    def _rewind(infile):
+        """Return a fresh reader positioned after the header"""
+        infile.seek(0)
+        reader = csv.reader(infile)
+        next(reader)
+        return reader
+    
+    @staticmethod
+    def _is_integer_column(reader, col_idx: int, sample_size: int = BITVECTOR_SAMPLE_ROWS) -> bool:
+        """Return True if every non-empty value in the first sample_size rows is an ASCII integer"""
+        found = False
+        for i, row in enumerate(reader):
+            if i >= sample_size:
+                break
+            if col_idx >= len(row):
+                continue
+            value = row[col_idx].strip()
+            if not value:
+                continue
+            if not (value.isascii() and value.isdigit()):
+                return False
+            found = True
+        return found
     
-    def _write_csv(self, rows_data: List[Dict[str, Any]], 
-                  fieldnames: List[str], output_file: str):
-        """Write rows data to CSV file"""
+    @staticmethod
+    def _estimate_row_count(input_file: str) -> int:
+        """Estimate the number of rows from the file size and the first MiB's line lengths"""
+        size = os.path.getsize(input_file)
+        with open(input_file, 'rb') as f:
+            sample = f.read(IO_BUFFER_SIZE)
+        lines = sample.count(b'\n')
+        if not lines or len(sample) >= size:
+            return max(lines, 1)
+        # Overshoot a little: an undersized filter only costs false positives
+        return int(size / (len(sample) / lines) * 1.1) + 1
+    
+    def _find_duplicate_candidates(self, reader, key: Callable[[List[str]], Hashable],
+                                   expected_rows: int) -> Set[Hashable]:
+        """
+        Return every key that may occur more than once, using a Bloom filter
+        
+        Each key's first occurrence only sets filter bits; a key is kept when
+        all its bits were already set. That covers every real duplicate plus a
+        few false positives, so the exact pass only needs to track these keys.
+        """
+        bloom = BloomFilter(expected_rows)
+        logger.info(f"Bloom prefilter: {bloom.size:,} bits, {bloom.hash_count} hashes "
+                    f"for ~{expected_rows:,} rows")
+        bloom_add = bloom.add
+        candidates: Set[Hashable] = set()
+        candidates_add = candidates.add
+        for row in reader:
+            if row:
+                k = key(row)
+                if bloom_add(_key_bytes(k)):
+                    candidates_add(k)
+        logger.info(f"Bloom prefilter: {len(candidates):,} candidate duplicate keys")
+        return candidates
+    
+    def _build_keep_last_mask(self, reader, key: Callable[[List[str]], Hashable],
+                              candidates: Optional[Set[Hashable]] = None) -> bytearray:
+        """
+        Return a per-row keep-mask (one byte per row) marking each key's last occurrence
+        
+        The mask costs one byte per row, far less than a set of row numbers.
+        With candidates, keys outside that set are known to occur once and are
+        kept without a last-index entry.
+        """
+        # Later rows simply overwrite earlier ones, so this stays a single linear pass
+        last_index: Dict[Hashable, int] = {}
+        
+        if candidates is not None:
+            keep_mask = bytearray()
+            append = keep_mask.append
+            for row in reader:
+                if not row:
+                    append(0)
+                    continue
+                k = key(row)
+                if k in candidates:
+                    last_index[k] = len(keep_mask)
+                    append(0)
+                else:
+                    append(1)
+            for i in last_index.values():
+                keep_mask[i] = 1
+            return keep_mask
+        
+        row_count = 0
+        for row_count, row in enumerate(reader, 1):
+            if row:
+                last_index[key(row)] = row_count - 1
+        
+        keep_mask = bytearray(row_count)
+        for i in last_index.values():
+            keep_mask[i] = 1
+        return keep_mask
+    
+    def _write_unique_rows(self, reader, fieldnames: List[str], key: Callable[[List[str]], Hashable],
+                           output_file: str, keep_mask: Optional[bytearray] = None,
+                           int_col_idx: Optional[int] = None,
+                           candidates: Optional[Set[Hashable]] = None):
+        """
+        Stream rows from reader to output_file, dropping duplicates
+        
+        Without keep_mask the first occurrence of each key is kept; with it,
+        exactly the rows flagged in the mask are kept (no key work in this pass).
+        With int_col_idx, canonical integer values of that column are tracked in
+        a bitvector and anything else falls back to the key set. With candidates
+        (see _find_duplicate_candidates) only those keys are tracked. Kept rows
+        are padded or truncated to the header's width.
+        """
+        # Ensure output directory exists
+        output_dir = os.path.dirname(output_file)
+        if output_dir:  # Only create directory if there's a path
+            os.makedirs(output_dir, exist_ok=True)
+        
+        # Write next to the target and swap in at the end, so --in-place never
+        # truncates the file that is still being read
+        tmp_file = f"{output_file}.tmp"
+        
         try:
-            # Ensure output directory exists
-            output_dir = os.path.dirname(output_file)
-            if output_dir:  # Only create directory if there's a path
-                os.makedirs(output_dir, exist_ok=True)
-            
-            with open(output_file, 'w', newline='', encoding='utf-8') as csvfile:
-                writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-                writer.writeheader()
+            with open(tmp_file, 'w', newline='', encoding='utf-8',
+                      buffering=IO_BUFFER_SIZE) as csvfile:
+                writer = csv.writer(csvfile)
+                writer.writerow(fieldnames)
+                
+                # Hot loops: bind methods to locals and count in locals. Kept rows
+                # are batched; a batch is flushed each time kept reaches a
+                # multiple of WRITE_BATCH_ROWS, so no batch straddles the boundary
+                writerows = writer.writerows
+                batch: List[List[str]] = []
+                append = batch.append
+                width = len(fieldnames)
+                total = kept = 0
                 
-                for row in rows_data:
-                    # Ensure all fieldnames are present in the row
-                    complete_row = {field: row.get(field, '') for field in fieldnames}
-                    writer.writerow(complete_row)
+                if keep_mask is not None:
+                    for i, row in enumerate(reader):
+                        if row:
+                            total += 1
+                            if not total % PROGRESS_EVERY:
+                                logger.info(f"Processed {total:,} rows, kept {kept:,}")
+                            if keep_mask[i]:
+                                append(row if len(row) == width else _fit_row(row, width))
+                                kept += 1
+                                if not kept % WRITE_BATCH_ROWS:
+                                    writerows(batch)
+                                    batch.clear()
+                elif candidates is not None:
+                    seen_values: Set[Hashable] = set()
+                    seen_add = seen_values.add
+                    for row in reader:
+                        if not row:
+                            continue
+                        total += 1
+                        if not total % PROGRESS_EVERY:
+                            logger.info(f"Processed {total:,} rows, kept {kept:,}")
+                        k = key(row)
+                        if k in candidates:
+                            seen = len(seen_values)
+                            seen_add(k)
+                            if len(seen_values) == seen:
+                                continue
+                        append(row if len(row) == width else _fit_row(row, width))
+                        kept += 1
+                        if not kept % WRITE_BATCH_ROWS:
+                            writerows(batch)
+                            batch.clear()
+                elif int_col_idx is not None:
+                    bits = bytearray((BITVECTOR_MAX_ID >> 3) + 1)
+                    other_values: Set[Hashable] = set()
+                    other_add = other_values.add
+                    for row in reader:
+                        if not row:
+                            continue
+                        total += 1
+                        if not total % PROGRESS_EVERY:
+                            logger.info(f"Processed {total:,} rows, kept {kept:,}")
+                        value = row[int_col_idx].strip() if int_col_idx < len(row) else ''
+                        if (0 < len(value) <= BITVECTOR_MAX_DIGITS and value[0] != '0'
+                                and value.isascii() and value.isdigit()):
+                            n = int(value)
+                            byte, bit = n >> 3, 1 << (n & 7)
+                            if bits[byte] & bit:
+                                continue
+                            bits[byte] |= bit
+                        else:
+                            seen = len(other_values)
+                            other_add(key(row))
+                            if len(other_values) == seen:
+                                continue
+                        append(row if len(row) == width else _fit_row(row, width))
+                        kept += 1
+                        if not kept % WRITE_BATCH_ROWS:
+                            writerows(batch)
+                            batch.clear()
+                else:
+                    seen_values: Set[Hashable] = set()
+                    seen_add = seen_values.add
+                    # kept always equals len(seen_values), so the set grows exactly
+                    # when the key is new - one hash probe per row instead of two
+                    for row in reader:
+                        if row:
+                            total += 1
+                            if not total % PROGRESS_EVERY:
+                                logger.info(f"Processed {total:,} rows, kept {kept:,}")
+                            seen_add(key(row))
+                            if len(seen_values) > kept:
+                                append(row if len(row) == width else _fit_row(row, width))
+                                kept += 1
+                                if not kept % WRITE_BATCH_ROWS:
+                                    writerows(batch)
+                                    batch.clear()
+                writerows(batch)
+            
+            self.total_rows = total
+            self.unique_rows = kept
+            self.duplicate_rows = total - kept
             
-            logger.info(f"Successfully wrote {len(rows_data)} rows to {output_file}")
+            if total == 0:
+                # Header only - leave the output untouched
+                os.unlink(tmp_file)
+                return
+            
+            os.replace(tmp_file, output_file)
+            logger.info(f"Successfully wrote {self.unique_rows} rows to {output_file}")
             
         except Exception as e:
             logger.error(f"Error writing CSV file: {str(e)}")
             logger.error(f"Output file path: {output_file}")
             logger.error(f"Output directory: {os.path.dirname(output_file)}")
+            if os.path.exists(tmp_file):
+                os.unlink(tmp_file)
             raise
     
+    @staticmethod
+    def _iter_key_fields(mm, col_idx: int):
+        """
+        Yield each remaining line of an unquoted file as a one-field row holding its key
+        
+        Empty lines yield [] and lines too short for the column yield [''],
+        exactly as csv.reader rows would look to the key functions.
+        """
+        for line in iter(mm.readline, b''):
+            line = line.rstrip(b'\r\n')
+            if not line:
+                yield []
+                continue
+            fields = line.split(b',', col_idx + 1)
+            yield [fields[col_idx].decode('utf-8') if col_idx < len(fields) else '']
+    
+    def _write_unique_lines(self, input_file: str, col_idx: int, keep_first: bool,
+                            case_sensitive: bool, hash_keys: bool, int_col_idx: Optional[int],
+                            output_file: str) -> bool:
+        """
+        Dedupe a file with no quoting, working on raw lines of a memory map
+        
+        Without quotes a line is a row and a comma is a field boundary, so only
+        the key field is sliced out and decoded; every other byte is copied
+        through untouched. Keep-last builds its mask from the key fields alone,
+        with the same mask builder as the csv path. Output matches
+        _write_unique_rows byte for byte.
+        
+        Returns:
+            False (having written nothing) if the file needs the csv module,
+            including when a kept line has a different field count than the header
+        """
+        with open(input_file, 'rb') as f, \
+                mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            _advise_sequential(f.fileno(), mm)
+            # Quotes may hide commas/newlines, and csv treats a bare CR as a line break
+            if mm.find(b'"') != -1 or re.search(rb'\r(?!\n)', mm):
+                return False
+            
+            output_dir = os.path.dirname(output_file)
+            if output_dir:
+                os.makedirs(output_dir, exist_ok=True)
+            tmp_file = f"{output_file}.tmp"
+            
+            value_key = self._value_key_function(case_sensitive, hash_keys)
+            header = mm.readline()
+            data_start = mm.tell()
+            # Lines with another field count must be padded/truncated by the csv path
+            commas = header.count(b',')
+            ragged = False
+            
+            keep_mask = None
+            if not keep_first:
+                keep_mask = self._build_keep_last_mask(
+                    self._iter_key_fields(mm, col_idx),
+                    self._key_function([0], case_sensitive, hash_keys)
+                )
+                mm.seek(data_start)
+            
+            try:
+                with open(tmp_file, 'wb', buffering=IO_BUFFER_SIZE) as out:
+                    write = out.write
+                    # csv.writer terminates every row with CRLF
+                    write(header.rstrip(b'\r\n') + b'\r\n')
+                    
+                    total = kept = 0
+                    seen_values: Set[Hashable] = set()
+                    seen_add = seen_values.add
+                    bits = bytearray((BITVECTOR_MAX_ID >> 3) + 1) if int_col_idx is not None else None
+                    
+                    if keep_mask is not None:
+                        for i, line in enumerate(iter(mm.readline, b'')):
+                            line = line.rstrip(b'\r\n')
+                            if line:
+                                total += 1
+                                if not total % PROGRESS_EVERY:
+                                    logger.info(f"Processed {total:,} rows, kept {kept:,}")
+                                if keep_mask[i]:
+                                    if line.count(b',') != commas:
+                                        ragged = True
+                                        break
+                                    write(line + b'\r\n')
+                                    kept += 1
+                    else:
+                        for line in iter(mm.readline, b''):
+                            line = line.rstrip(b'\r\n')
+                            if not line:
+                                continue
+                            total += 1
+                            if not total % PROGRESS_EVERY:
+                                logger.info(f"Processed {total:,} rows, kept {kept:,}")
+                            
+                            fields = line.split(b',', col_idx + 1)
+                            raw = fields[col_idx].decode('utf-8') if col_idx < len(fields) else ''
+                            
+                            value = raw.strip()
+                            if (bits is not None and 0 < len(value) <= BITVECTOR_MAX_DIGITS
+                                    and value[0] != '0' and value.isascii() and value.isdigit()):
+                                # Same id rules as the bitvector path in _write_unique_rows
+                                n = int(value)
+                                byte, bit = n >> 3, 1 << (n & 7)
+                                if bits[byte] & bit:
+                                    continue
+                                bits[byte] |= bit
+                            else:
+                                seen = len(seen_values)
+                                seen_add(value_key(raw))
+                                if len(seen_values) == seen:
+                                    continue
+                            
+                            if line.count(b',') != commas:
+                                ragged = True
+                                break
+                            write(line + b'\r\n')
+                            kept += 1
+            except Exception as e:
+                logger.error(f"Error writing CSV file: {str(e)}")
+                logger.error(f"Output file path: {output_file}")
+                if os.path.exists(tmp_file):
+                    os.unlink(tmp_file)
+                raise
+        
+        if ragged:
+            os.unlink(tmp_file)
+            logger.info("Rows don't all match the header's field count - using the csv reader")
+            return False
+        
+        self.total_rows = total
+        self.unique_rows = kept
+        self.duplicate_rows = total - kept
+        
+        if total == 0:
+            # Header only - leave the output untouched
+            os.unlink(tmp_file)
+            return True
+        
+        # Swap in only after the map is closed: Windows can't replace a mapped file (--in-place)
+        os.replace(tmp_file, output_file)
+        logger.info(f"Successfully wrote {self.unique_rows} rows to {output_file}")
+        return True
+    
     def _print_summary(self, input_file: str, output_file: str):
         """Print processing summary"""
         if self.start_time:
@@ -208,6 +1090,83 @@ class DuplicateRemover:
             logger.info("=" * 60)
 
 
+def dedupe_file(input_file: str, output_file: str, column: str, keep_first: bool = True,
+                case_sensitive: bool = True, hash_keys: bool = False,
+                bloom_prefilter: bool = False) -> Tuple[str, bool]:
+    """
+    Remove duplicates from one file; module-level so it can run in a worker process
+    
+    Returns:
+        (input_file, success) tuple
+    """
+    remover = DuplicateRemover()
+    success = remover.remove_duplicates(
+        input_file=input_file,
+        output_file=output_file,
+        column=column,
+        keep_first=keep_first,
+        case_sensitive=case_sensitive,
+        hash_keys=hash_keys,
+        bloom_prefilter=bloom_prefilter
+    )
+    return input_file, success
+
+
+def _dedupe_file_star(args: tuple) -> Tuple[str, bool]:
+    """Unpack an argument tuple for Pool.imap_unordered"""
+    return dedupe_file(*args)
+
+
+def _dedupe_byte_range(input_file: str, start: int, end: int, col_idx: int,
+                       case_sensitive: bool, hash_keys: bool, commas: int,
+                       output_file: str) -> Tuple[str, int]:
+    """
+    Keep-first dedupe of the unquoted lines in input_file[start:end]; module-level for Pool
+    
+    Kept lines are written to output_file with CRLF endings, as csv.writer would.
+    
+    Returns:
+        (output_file, rows_read) tuple; rows_read is -1 if a kept line doesn't
+        have exactly commas commas (the csv path has to pad or truncate it)
+    """
+    value_key = DuplicateRemover._value_key_function(case_sensitive, hash_keys)
+    total = kept = 0
+    seen_values: Set[Hashable] = set()
+    seen_add = seen_values.add
+    with open(input_file, 'rb') as f, \
+            mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, \
+            open(output_file, 'wb', buffering=IO_BUFFER_SIZE) as out:
+        _advise_sequential(f.fileno(), mm)
+        write = out.write
+        mm.seek(start)
+        readline = mm.readline
+        while mm.tell() < end:
+            line = readline().rstrip(b'\r\n')
+            if not line:
+                continue
+            total += 1
+            fields = line.split(b',', col_idx + 1)
+            raw = fields[col_idx].decode('utf-8') if col_idx < len(fields) else ''
+            seen_add(value_key(raw))
+            if len(seen_values) > kept:
+                if line.count(b',') != commas:
+                    return output_file, -1
+                write(line + b'\r\n')
+                kept += 1
+    return output_file, total
+
+
+def _dedupe_byte_range_star(args: tuple) -> Tuple[str, int]:
+    """Unpack an argument tuple for Pool.map"""
+    return _dedupe_byte_range(*args)
+
+
+def default_output_file(input_file: str) -> str:
+    """Return the default output path for an input file"""
+    base_name = os.path.splitext(input_file)[0]
+    return f"{base_name}_deduplicated.csv"
+
+
 def create_backup(input_file: str) -> str:
     """Create a backup of the input file"""
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -223,8 +1182,56 @@ def create_backup(input_file: str) -> str:
         return ""
 
 
-def main():
-    """Main function to handle command line arguments and execute duplicate removal"""
+def run_many(args):
+    """Deduplicate every file matching args.inputs, one file per worker process"""
+    files = sorted(f for f in glob.glob(args.inputs)
+                   if not os.path.splitext(f)[0].endswith('_deduplicated'))
+    if not files:
+        logger.error(f"No input files match: {args.inputs}")
+        sys.exit(1)
+    
+    jobs = max(1, min(args.jobs, len(files)))
+    logger.info(f"Processing {len(files)} files with {jobs} worker(s)")
+    
+    tasks = []
+    for input_file in files:
+        output_file = input_file if args.in_place else default_output_file(input_file)
+        output_file = os.path.abspath(output_file)
+        
+        if args.dry_run:
+            logger.info(f"Would process: {input_file} -> {output_file}")
+            continue
+        
+        if args.backup and not create_backup(input_file):
+            logger.error("Failed to create backup. Aborting.")
+            sys.exit(1)
+        
+        tasks.append((input_file, output_file, args.column, not args.keep_last,
+                      not args.case_insensitive, args.hash_keys, args.bloom))
+    
+    if args.dry_run:
+        logger.info("DRY RUN MODE - No files will be modified")
+        return
+    
+    # Files share no state, so each one is deduplicated in its own process
+    failed = []
+    with Pool(jobs) as pool:
+        for input_file, success in pool.imap_unordered(_dedupe_file_star, tasks):
+            if success:
+                logger.info(f"Finished: {input_file}")
+            else:
+                logger.error(f"Failed: {input_file}")
+                failed.append(input_file)
+    
+    if failed:
+        logger.error(f"Duplicate removal failed for {len(failed)} of {len(files)} files")
+        sys.exit(1)
+    logger.info(f"Duplicate removal completed successfully for {len(files)} files!")
+    sys.exit(0)
+
+
+def main(argv: Optional[List[str]] = None):
+    """Main function to handle command line arguments (default: sys.argv) and execute duplicate removal"""
     parser = argparse.ArgumentParser(
         description="Remove duplicates from CSV files based on a specified column",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -233,27 +1240,66 @@ Examples:
   python remove_duplicates.py data.csv --column email
   python remove_duplicates.py data.csv --column customerId --output clean_data.csv
   python remove_duplicates.py data.csv --column name --keep-last --case-insensitive
+  python remove_duplicates.py data.csv --column firstName,lastName,email
   python remove_duplicates.py data.csv --column id --backup --in-place
+  python remove_duplicates.py --inputs "exports/*.csv" --column custId --jobs 4
+  python remove_duplicates.py huge.csv --column email --shards 8
+  python remove_duplicates.py huge.csv --column email --chunks 8
+  python remove_duplicates.py data.csv --column email --stats-only
         """
     )
     
-    parser.add_argument('input_file', help='Input CSV file path')
+    parser.add_argument('input_file', nargs='?', help='Input CSV file path')
+    parser.add_argument('--inputs',
+                       help='Glob pattern of input CSV files to process in parallel (e.g. "exports/*.csv")')
+    parser.add_argument('--jobs', '-j', type=int, default=os.cpu_count() or 1,
+                       help='Worker processes for --inputs/--shards/--chunks (default: number of CPUs)')
+    parser.add_argument('--shards', type=int, default=0,
+                       help='Split a single large input into N hash shards and deduplicate them in parallel')
+    parser.add_argument('--chunks', type=int, default=0,
+                       help='Split a single large unquoted input into N byte ranges and deduplicate them in parallel')
     parser.add_argument('--column', '-c', required=True, 
-                       help='Column name to check for duplicates')
+                       help='Column name to check for duplicates (comma-separated for a composite key)')
     parser.add_argument('--output', '-o', 
                        help='Output CSV file path (default: input_file_deduplicated.csv)')
     parser.add_argument('--keep-last', action='store_true',
                        help='Keep last occurrence instead of first (default: keep first)')
     parser.add_argument('--case-insensitive', action='store_true',
                        help='Treat values case-insensitively (default: case sensitive)')
+    parser.add_argument('--hash-keys', action='store_true',
+                       help='Track 64-bit hashes of values instead of the values (saves memory on long values)')
+    parser.add_argument('--bloom', action='store_true',
+                       help='Pre-scan with a Bloom filter and track only likely duplicates (less memory, one extra pass)')
     parser.add_argument('--backup', action='store_true',
                        help='Create backup of original file')
     parser.add_argument('--in-place', action='store_true',
                        help='Modify the input file in place (overwrites original)')
     parser.add_argument('--dry-run', action='store_true',
                        help='Show what would be done without making changes')
+    parser.add_argument('--stats-only', action='store_true',
+                       help='Only count duplicates and show the most repeated values; writes nothing')
+    
+    args = parser.parse_args(argv)
     
-    args = parser.parse_args()
+    if args.inputs:
+        if args.input_file:
+            parser.error("input_file and --inputs are mutually exclusive")
+        if args.output:
+            parser.error("--output cannot be used with --inputs")
+        if args.stats_only:
+            parser.error("--stats-only works on a single input_file")
+        run_many(args)
+        return
+    if not args.input_file:
+        parser.error("input_file or --inputs is required")
+    if args.shards > 1 and args.chunks > 1:
+        parser.error("--shards and --chunks are mutually exclusive")
+    
+    if args.stats_only:
+        remover = DuplicateRemover()
+        success = remover.collect_stats(args.input_file, args.column,
+                                        case_sensitive=not args.case_insensitive)
+        sys.exit(0 if success else 1)
     
     # Validate input file
     if not os.path.exists(args.input_file):
@@ -269,8 +1315,7 @@ Examples:
         output_file = args.output
     else:
         # Generate default output filename
-        base_name = os.path.splitext(args.input_file)[0]
-        output_file = f"{base_name}_deduplicated.csv"
+        output_file = default_output_file(args.input_file)
     
     # Validate output file path
     if not output_file or not output_file.strip():
@@ -299,17 +1344,47 @@ Examples:
         logger.info(f"Would remove duplicates based on column: {args.column}")
         logger.info(f"Would keep {'last' if args.keep_last else 'first'} occurrence")
         logger.info(f"Case sensitive: {not args.case_insensitive}")
+        if args.shards > 1:
+            logger.info(f"Would split into {args.shards} shards across {args.jobs} worker(s)")
+        if args.chunks > 1:
+            logger.info(f"Would split into {args.chunks} chunks across {args.jobs} worker(s)")
         return
     
     # Process the file
-    remover = DuplicateRemover()
-    success = remover.remove_duplicates(
-        input_file=args.input_file,
-        output_file=output_file,
-        column=args.column,
-        keep_first=not args.keep_last,
-        case_sensitive=not args.case_insensitive
-    )
+    if args.chunks > 1:
+        remover = DuplicateRemover()
+        success = remover.remove_duplicates_chunked(
+            input_file=args.input_file,
+            output_file=output_file,
+            column=args.column,
+            chunks=args.chunks,
+            jobs=args.jobs,
+            keep_first=not args.keep_last,
+            case_sensitive=not args.case_insensitive,
+            hash_keys=args.hash_keys
+        )
+    elif args.shards > 1:
+        remover = DuplicateRemover()
+        success = remover.remove_duplicates_sharded(
+            input_file=args.input_file,
+            output_file=output_file,
+            column=args.column,
+            shards=args.shards,
+            jobs=args.jobs,
+            keep_first=not args.keep_last,
+            case_sensitive=not args.case_insensitive,
+            hash_keys=args.hash_keys
+        )
+    else:
+        _, success = dedupe_file(
+            input_file=args.input_file,
+            output_file=output_file,
+            column=args.column,
+            keep_first=not args.keep_last,
+            case_sensitive=not args.case_insensitive,
+            hash_keys=args.hash_keys,
+            bloom_prefilter=args.bloom
+        )
     
     if success:
         logger.info("Duplicate removal completed successfully!")
@@ -8,8 +8,8 @@ This script runs the export scripts in the background with proper logging and mo
 import os
 import sys
 import subprocess
-import time
 import argparse
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 
@@ -56,34 +56,33 @@ def run_export_background(script_name, csv_file=None, output_file=None, id_colum
     print("-" * 60)
     
     try:
-        # Run the script in background
+        # Run the script in background. The child inherits its own copy of the
+        # log descriptor, so closing ours once Popen returns is safe (and avoids
+        # leaking it in this process).
         with open(log_file, 'w') as log:
             process = subprocess.Popen(
                 cmd,
                 stdout=log,
-                stderr=subprocess.STDOUT,
-                text=True,
-                bufsize=1
+                stderr=subprocess.STDOUT
             )
-        
-        print(f"Process started with PID: {process.pid}")
-        
-        # Platform-specific monitoring commands
-        import platform
-        if platform.system() == "Windows":
-            print(f"Check progress with: Get-Content {log_file} -Wait")
-            print(f"Check if running with: tasklist | findstr python")
-            print(f"To stop: taskkill /PID {process.pid}")
-        else:
-            print(f"Check progress with: tail -f {log_file}")
-            print(f"Check if running with: ps aux | grep python")
-            print(f"To stop: kill {process.pid}")
-            
-            return True
-        
     except Exception as e:
         print(f"Error starting background process: {e}")
         return False
+    
+    print(f"Process started with PID: {process.pid}")
+    
+    # Platform-specific monitoring commands
+    import platform
+    if platform.system() == "Windows":
+        print(f"Check progress with: Get-Content {log_file} -Wait")
+        print(f"Check if running with: tasklist | findstr python")
+        print(f"To stop: taskkill /PID {process.pid}")
+    else:
+        print(f"Check progress with: tail -f {log_file}")
+        print(f"Check if running with: ps aux | grep python")
+        print(f"To stop: kill {process.pid}")
+    
+    return True
 
 def run_all_exports_background(csv_file=None, output_dir=None, log_file=None):
     """
@@ -92,7 +91,8 @@ def run_all_exports_background(csv_file=None, output_dir=None, log_file=None):
     Args:
         csv_file: Path to CSV file containing customer IDs (optional for contact export)
         output_dir: Directory for output files
-        log_file: Optional log file path
+        log_file: Optional log file path; each script logs to its own file
+            derived from it (<log_file>_<script>.log)
     """
     
     scripts = [
@@ -103,61 +103,71 @@ def run_all_exports_background(csv_file=None, output_dir=None, log_file=None):
         'export_purchased_products.py'
     ]
     
-    if log_file is None:
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        log_file = f"all_exports_background_{timestamp}.log"
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    log_base = os.path.splitext(log_file)[0] if log_file else None
     
     print(f"Starting all export scripts in background...")
     print(f"CSV file: {csv_file}")
-    print(f"Log file: {log_file}")
     print(f"Started at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     print("=" * 60)
     
-    processes = []
-    
+    def start_one(script):
+        """Start one export with its own log file; returns (script, process, log_path)"""
+        # Separate log files, so concurrent children never interleave or race on appends
+        if log_base:
+            log_path = f"{log_base}_{script.replace('.py', '')}.log"
+        else:
+            log_path = f"{script.replace('.py', '')}_background_{timestamp}.log"
+        
+        cmd = [sys.executable, script]
+        if csv_file:
+            cmd.append(csv_file)
+        if output_dir:
+            cmd.extend(['--output', os.path.join(output_dir, f"{script.replace('.py', '')}_export.csv")])
+        
+        try:
+            with open(log_path, 'w') as log:
+                log.write(f"{'='*60}\n")
+                log.write(f"Starting {script} at {datetime.now()}\n")
+                log.write(f"Command: {' '.join(cmd)}\n")
+                log.write(f"{'='*60}\n")
+                log.flush()
+                
+                process = subprocess.Popen(
+                    cmd,
+                    stdout=log,
+                    stderr=subprocess.STDOUT
+                )
+            return script, process, log_path
+        except Exception as e:
+            print(f"Error starting {script}: {e}")
+            return script, None, log_path
+    
+    available = []
     for script in scripts:
         if Path(script).exists():
-            cmd = [sys.executable, script]
-            if csv_file:
-                cmd.append(csv_file)
-            if output_dir:
-                cmd.extend(['--output', os.path.join(output_dir, f"{script.replace('.py', '')}_export.csv")])
-            
-            try:
-                with open(log_file, 'a') as log:
-                    log.write(f"\n{'='*60}\n")
-                    log.write(f"Starting {script} at {datetime.now()}\n")
-                    log.write(f"Command: {' '.join(cmd)}\n")
-                    log.write(f"{'='*60}\n")
-                    
-                    process = subprocess.Popen(
-                        cmd,
-                        stdout=log,
-                        stderr=subprocess.STDOUT,
-                        text=True,
-                        bufsize=1
-                    )
-                
-                processes.append((script, process))
-                print(f"Started {script} with PID: {process.pid}")
-                
-                # Small delay between starting scripts
-                time.sleep(2)
-                
-            except Exception as e:
-                print(f"Error starting {script}: {e}")
+            available.append(script)
         else:
             print(f"Warning: {script} not found, skipping...")
     
+    processes = []
+    if available:
+        with ThreadPoolExecutor(max_workers=len(available)) as executor:
+            for script, process, log_path in executor.map(start_one, available):
+                if process is not None:
+                    processes.append((script, process))
+                    print(f"Started {script} with PID: {process.pid} (log: {log_path})")
+    
     print(f"\nAll processes started!")
     
     # Platform-specific monitoring commands
     import platform
+    log_glob = f"{log_base}_*.log" if log_base else f"*_background_{timestamp}.log"
     if platform.system() == "Windows":
-        print(f"Check progress with: Get-Content {log_file} -Wait")
+        print(f"Check progress with: Get-Content {log_glob} -Wait")
         print(f"Check if running with: tasklist | findstr python")
     else:
-        print(f"Check progress with: tail -f {log_file}")
+        print(f"Check progress with: tail -f {log_glob}")
         print(f"Check if running with: ps aux | grep python")
     
     print(f"Process PIDs: {[p[1].pid for p in processes]}")
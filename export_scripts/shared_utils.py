@@ -7,25 +7,28 @@ import os
 import sys
 import csv
 import logging
+import mmap
+import queue
+import re
+import sqlite3
+import threading
+import time
 import xml.etree.ElementTree as ET
-from typing import List, Dict, Any, Optional
+from itertools import chain, islice
+from operator import itemgetter
+from typing import List, Dict, Any, Iterable, Iterator, Optional, Sequence, Set
 from datetime import datetime
-import requests
-from dotenv import load_dotenv
 
 # Add current directory to Python path first (for local config)
-sys.path.insert(0, os.path.dirname(__file__))
+_EXPORT_DIR = os.path.dirname(os.path.abspath(__file__))
+if _EXPORT_DIR not in sys.path:
+    sys.path.insert(0, _EXPORT_DIR)
 
-# Import local config module first
+# Import local config module first (it loads .env)
 from config import ExportConfig
 
-# Add src directory to Python path
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
-
-from services.acgi_client import ACGIClient
-
-# Load environment variables from .env file
-load_dotenv()
+# src is only needed once an exporter is created (see BaseExporter.__init__)
+_SRC_DIR = os.path.normpath(os.path.join(_EXPORT_DIR, '..', 'src'))
 
 # Configure logging
 log_level = getattr(logging, ExportConfig.LOG_LEVEL.upper(), logging.INFO)
@@ -38,13 +41,144 @@ logging.basicConfig(
     level=log_level,
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
     handlers=[
-        logging.FileHandler(log_file_path),
+        logging.FileHandler(log_file_path, delay=True),
         logging.StreamHandler()
     ]
 )
 logger = logging.getLogger(__name__)
 
 
+class RateLimiter:
+    """Space requests at least `interval` seconds apart (token bucket with a single token)"""
+    
+    def __init__(self, interval: float):
+        self.interval = interval
+        self.next_allowed = time.monotonic()
+    
+    def acquire(self):
+        """Block until the next request may be sent"""
+        now = time.monotonic()
+        wait = self.next_allowed - now
+        if wait > 0:
+            time.sleep(wait)
+        # A request that already took longer than the interval is not penalized again
+        self.next_allowed = max(now, self.next_allowed) + self.interval
+
+
+def iter_row_values(rows: Iterable[Dict[str, Any]], fieldnames: List[str]) -> Iterator[Sequence[Any]]:
+    """
+    Yield each row's values in fieldnames order, for csv.writer
+    
+    Rows holding every field take a single C-level itemgetter call; rows with
+    missing fields fall back to '' for those. Extra keys are ignored.
+    """
+    if len(fieldnames) == 1:
+        field = fieldnames[0]
+        getter = lambda row: (row[field],)
+    else:
+        getter = itemgetter(*fieldnames)
+    
+    for row in rows:
+        try:
+            yield getter(row)
+        except KeyError:
+            yield [row.get(field, '') for field in fieldnames]
+
+
+def iter_chunks(rows: Iterable[Any], size: int = 1000) -> Iterator[List[Any]]:
+    """Yield lists of up to size items, so streamed rows are written a chunk at a time"""
+    rows = iter(rows)
+    while True:
+        chunk = list(islice(rows, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _peek(rows: Iterable[Any]) -> Optional[Iterator[Any]]:
+    """Return an iterator over all of rows, or None if it is empty"""
+    rows = iter(rows)
+    first = next(rows, None)
+    if first is None:
+        return None
+    return chain((first,), rows)
+
+
+class CSVWriterThread(threading.Thread):
+    """Write CSV rows from a background thread so disk I/O stays off the fetch loop"""
+    
+    def __init__(self, output_file: str, fieldnames: List[str], append: bool = False, maxsize: int = 32):
+        """
+        Args:
+            output_file: Output file path
+            fieldnames: List of column names
+            append: Append to an existing file instead of truncating it
+            maxsize: Maximum queued batches before put() blocks (back-pressure)
+        """
+        super().__init__(name=f"csv-writer-{os.path.basename(output_file)}", daemon=True)
+        self.output_file = output_file
+        self.fieldnames = fieldnames
+        self.append = append
+        self.rows_written = 0
+        self.error = None
+        self._queue = queue.Queue(maxsize=maxsize)
+    
+    def run(self):
+        try:
+            output_dir = os.path.dirname(self.output_file)
+            if output_dir:
+                os.makedirs(output_dir, exist_ok=True)
+            
+            write_header = not (self.append and os.path.exists(self.output_file) and os.path.getsize(self.output_file) > 0)
+            with open(self.output_file, 'a' if self.append else 'w', newline='', encoding='utf-8',
+                      buffering=1 << 20) as csvfile:
+                writer = csv.writer(csvfile)
+                if write_header:
+                    writer.writerow(self.fieldnames)
+                
+                while True:
+                    rows = self._queue.get()
+                    try:
+                        if rows is None:
+                            return
+                        writer.writerows(iter_row_values(rows, self.fieldnames))
+                        self.rows_written += len(rows)
+                        if self._queue.empty():
+                            csvfile.flush()
+                    finally:
+                        self._queue.task_done()
+        except Exception as e:
+            self.error = e
+            logger.error(f"CSV writer for {self.output_file} failed: {str(e)}")
+            # Keep draining so producers and drain() never block on a dead writer
+            while True:
+                rows = self._queue.get()
+                self._queue.task_done()
+                if rows is None:
+                    return
+    
+    def _raise_if_failed(self):
+        if self.error is not None:
+            raise RuntimeError(f"CSV writer for {self.output_file} failed: {self.error}")
+    
+    def put(self, rows: List[Dict[str, Any]]):
+        """Queue a batch of rows (missing fields are written as '')"""
+        self._raise_if_failed()
+        self._queue.put(rows)
+    
+    def drain(self):
+        """Block until every queued batch has been written and flushed"""
+        self._queue.join()
+        self._raise_if_failed()
+    
+    def close(self):
+        """Flush remaining rows, close the file and stop the thread"""
+        self._queue.put(None)
+        self.join()
+        self._raise_if_failed()
+        logger.info(f"Exported {self.rows_written} records to {self.output_file}")
+
+
 class BaseExporter:
     """Base class for all ACGI export scripts"""
     
@@ -55,20 +189,46 @@ class BaseExporter:
         Args:
             credentials: Dictionary containing ACGI credentials
         """
+        # Imported here so CSV-only users of this module skip the HTTP stack at startup
+        import requests
+        if _SRC_DIR not in sys.path:
+            sys.path.insert(0, _SRC_DIR)
+        from services.acgi_client import ACGIClient
+        
         self.credentials = credentials
-        self.acgi_client = ACGIClient()
         self.base_url = "https://ams.cfma.org"
         self.session = requests.Session()
         self.session.headers.update({
             'Content-Type': 'application/x-www-form-urlencoded',
             'User-Agent': 'ACGI-Export/1.0'
         })
+        # Share one keep-alive session so every request reuses the same TLS connection
+        self.acgi_client = ACGIClient(session=self.session)
+        self.rate_limiter = RateLimiter(ExportConfig.REQUEST_DELAY)
         
         # Statistics
         self.total_processed = 0
         self.total_exported = 0
         self.total_errors = 0
         self.start_time = None
+        
+        # Resume checkpoint (see open_checkpoint)
+        self._ckpt = None
+        self._ckpt_pending = []
+        
+        # Optional background CSV writer (see CSVWriterThread)
+        self.csv_writer = None
+    
+    def close(self):
+        """Close the HTTP session and the checkpoint DB"""
+        self.close_checkpoint()
+        self.session.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
     
     def read_customer_ids_from_csv(self, csv_file_path: str, id_column: str = 'custId') -> List[str]:
         """
@@ -81,22 +241,10 @@ class BaseExporter:
         Returns:
             List of customer IDs
         """
-        customer_ids = []
-        
         try:
-            with open(csv_file_path, 'r', newline='', encoding='utf-8') as csvfile:
-                reader = csv.DictReader(csvfile)
-                
-                if id_column not in reader.fieldnames:
-                    raise ValueError(f"Column '{id_column}' not found in CSV. Available columns: {reader.fieldnames}")
-                
-                for row in reader:
-                    customer_id = row.get(id_column, '').strip()
-                    if customer_id and customer_id.isdigit():
-                        customer_ids.append(customer_id)
-                
-                logger.info(f"Read {len(customer_ids)} customer IDs from {csv_file_path}")
-                return customer_ids
+            customer_ids = list(self.iter_customer_ids(csv_file_path, id_column))
+            logger.info(f"Read {len(customer_ids)} customer IDs from {csv_file_path}")
+            return customer_ids
                 
         except FileNotFoundError:
             logger.error(f"CSV file not found: {csv_file_path}")
@@ -105,50 +253,108 @@ class BaseExporter:
             logger.error(f"Error reading CSV file: {str(e)}")
             raise
     
+    def iter_customer_ids(self, csv_file_path: str, id_column: str = 'custId') -> Iterator[str]:
+        """
+        Yield numeric customer IDs from a CSV file
+        
+        The file is memory-mapped and a single compiled bytes regex walks it,
+        picking out lines whose ID column is all digits - the per-line
+        split/strip/isdigit checks run in C. Files containing quoted fields
+        fall back to the csv module.
+        
+        Args:
+            csv_file_path: Path to the CSV file
+            id_column: Name of the column containing customer IDs
+        """
+        with open(csv_file_path, 'rb') as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                raise ValueError(f"Column '{id_column}' not found in CSV. Available columns: None")
+            
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                fieldnames = next(csv.reader([mm.readline().decode('utf-8-sig')]), [])
+                if id_column not in fieldnames:
+                    raise ValueError(f"Column '{id_column}' not found in CSV. Available columns: {fieldnames}")
+                
+                if mm.find(b'"') != -1:
+                    # Quoted fields may hide commas or newlines
+                    yield from self._iter_customer_ids_csv(csv_file_path, id_column)
+                    return
+                
+                # Skip col_idx fields, then the ID: digits with optional padding up to the next field
+                pattern = re.compile(
+                    rb'^(?:[^,\n]*,){%d}[ \t\r\x0b\x0c]*(\d+)[ \t\r\x0b\x0c]*(?:,|$)'
+                    % fieldnames.index(id_column),
+                    re.MULTILINE
+                )
+                for match in pattern.finditer(mm, mm.tell()):
+                    yield match.group(1).decode('ascii')
+    
+    def _iter_customer_ids_csv(self, csv_file_path: str, id_column: str) -> Iterator[str]:
+        """Yield numeric customer IDs using the csv module (handles quoted fields)"""
+        with open(csv_file_path, 'r', newline='', encoding='utf-8-sig',
+                  buffering=1 << 20) as csvfile:
+            reader = csv.reader(csvfile)
+            col_idx = next(reader).index(id_column)
+            
+            for row in reader:
+                if col_idx < len(row):
+                    customer_id = row[col_idx].strip()
+                    if customer_id and customer_id.isdigit():
+                        yield customer_id
+    
     def get_element_text(self, parent: ET.Element, tag: str) -> Optional[str]:
         """Safely get text from an XML element"""
         elem = parent.find(tag)
         return elem.text if elem is not None else None
     
-    def write_to_csv(self, data: List[Dict[str, Any]], output_file: str, fieldnames: List[str]):
+    def write_to_csv(self, data: Iterable[Dict[str, Any]], output_file: str, fieldnames: List[str]) -> int:
         """
         Write data to CSV file
         
         Args:
-            data: List of dictionaries to write
+            data: Dictionaries to write; a generator is streamed without being materialized
             output_file: Output file path
             fieldnames: List of column names
+            
+        Returns:
+            Number of records written
         """
-        if not data:
+        rows = _peek(data)
+        if rows is None:
             logger.warning("No data to export")
-            return
+            return 0
         
         # Ensure output directory exists
         os.makedirs(os.path.dirname(output_file), exist_ok=True)
         
-        with open(output_file, 'w', newline='', encoding='utf-8') as csvfile:
-            writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-            writer.writeheader()
-            
-            for row in data:
-                # Ensure all fieldnames are present in the row
-                complete_row = {field: row.get(field, '') for field in fieldnames}
-                writer.writerow(complete_row)
+        written = 0
+        with open(output_file, 'w', newline='', encoding='utf-8',
+                  buffering=1 << 20) as csvfile:
+            writer = csv.writer(csvfile)
+            writer.writerow(fieldnames)
+            for chunk in iter_chunks(rows):
+                writer.writerows(iter_row_values(chunk, fieldnames))
+                written += len(chunk)
         
-        logger.info(f"Exported {len(data)} records to {output_file}")
+        logger.info(f"Exported {written} records to {output_file}")
+        return written
     
-    def write_batch_to_csv(self, data: List[Dict[str, Any]], output_file: str, fieldnames: List[str], is_first_batch: bool = False):
+    def write_batch_to_csv(self, data: Iterable[Dict[str, Any]], output_file: str, fieldnames: List[str], is_first_batch: bool = False) -> int:
         """
         Write batch data to CSV file incrementally
         
         Args:
-            data: List of dictionaries to write
+            data: Dictionaries to write; a generator is streamed without being materialized
             output_file: Output file path
             fieldnames: List of column names
             is_first_batch: Whether this is the first batch (write header)
+            
+        Returns:
+            Number of records written
         """
-        if not data:
-            return
+        rows = _peek(data)
+        if rows is None:
+            return 0
         
         # Ensure output directory exists
         os.makedirs(os.path.dirname(output_file), exist_ok=True)
@@ -157,19 +363,111 @@ class BaseExporter:
         file_exists = os.path.exists(output_file)
         write_mode = 'w' if is_first_batch or not file_exists else 'a'
         
-        with open(output_file, write_mode, newline='', encoding='utf-8') as csvfile:
-            writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
+        with open(output_file, write_mode, newline='', encoding='utf-8',
+                  buffering=1 << 20) as csvfile:
+            writer = csv.writer(csvfile)
             
             # Write header only for first batch or new file
             if is_first_batch or not file_exists:
-                writer.writeheader()
+                writer.writerow(fieldnames)
+            
+            written = 0
+            for chunk in iter_chunks(rows):
+                writer.writerows(iter_row_values(chunk, fieldnames))
+                written += len(chunk)
+        
+        logger.info(f"Batch of {written} records written to {output_file}")
+        return written
+    
+    def open_checkpoint(self, checkpoint_path: str, source: str, resume: bool = False) -> Set[str]:
+        """
+        Open (or create) the sqlite checkpoint DB used to resume an interrupted export
+        
+        Args:
+            checkpoint_path: Path to the checkpoint database file
+            source: Identifies the input file the checkpoint belongs to
+            resume: Keep the customers recorded by a previous run; otherwise the
+                checkpoint is reset. A checkpoint recorded for another source is
+                always reset.
             
-            for row in data:
-                # Ensure all fieldnames are present in the row
-                complete_row = {field: row.get(field, '') for field in fieldnames}
-                writer.writerow(complete_row)
+        Returns:
+            Set of customer IDs already completed by a previous run
+        """
+        checkpoint_dir = os.path.dirname(checkpoint_path)
+        if checkpoint_dir:
+            os.makedirs(checkpoint_dir, exist_ok=True)
+        
+        self._ckpt = sqlite3.connect(checkpoint_path)
+        self._ckpt.execute('PRAGMA journal_mode=WAL')
+        self._ckpt.execute(
+            'CREATE TABLE IF NOT EXISTS done ('
+            'cid TEXT PRIMARY KEY, '
+            'rows_written INTEGER NOT NULL DEFAULT 0)'
+        )
+        self._ckpt.execute('CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)')
+        self._ckpt_pending = []
+        
+        row = self._ckpt.execute("SELECT value FROM meta WHERE key = 'source'").fetchone()
+        if row is not None and row[0] != source:
+            logger.warning(f"Checkpoint {checkpoint_path} belongs to {row[0]}, starting over")
+            resume = False
+        if not resume:
+            self._ckpt.execute('DELETE FROM done')
+        self._ckpt.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('source', ?)", (source,))
+        self._ckpt.commit()
+        
+        done = {row[0] for row in self._ckpt.execute('SELECT cid FROM done')}
+        if done:
+            logger.info(f"Resuming from checkpoint {checkpoint_path}: {len(done)} customers already exported")
+        return done
+    
+    def mark_customer_done(self, customer_id: str, rows_written: int):
+        """
+        Record a successfully exported customer in the checkpoint DB
+        
+        Inserts are batched (ExportConfig.CHECKPOINT_BATCH_SIZE), so a hard crash
+        can re-export at most one batch worth of customers on the next run.
+        """
+        if self._ckpt is None:
+            return
         
-        logger.info(f"Batch of {len(data)} records written to {output_file}")
+        self._ckpt_pending.append((customer_id, rows_written))
+        if len(self._ckpt_pending) >= ExportConfig.CHECKPOINT_BATCH_SIZE:
+            self.flush_checkpoint()
+    
+    def flush_checkpoint(self):
+        """Commit pending checkpoint rows"""
+        if self._ckpt is None or not self._ckpt_pending:
+            return
+        
+        # Only record customers whose rows have actually reached the output file
+        if self.csv_writer is not None:
+            self.csv_writer.drain()
+        
+        self._ckpt.executemany(
+            'INSERT OR IGNORE INTO done (cid, rows_written) VALUES (?, ?)',
+            self._ckpt_pending
+        )
+        self._ckpt.commit()
+        self._ckpt_pending = []
+    
+    def close_checkpoint(self):
+        """Flush pending checkpoint rows and close the checkpoint DB"""
+        if self._ckpt is None:
+            return
+        
+        try:
+            self.flush_checkpoint()
+        finally:
+            self._ckpt.close()
+            self._ckpt = None
+    
+    def remove_checkpoint(self, checkpoint_path: str):
+        """Close and delete the checkpoint DB once the export has finished cleanly"""
+        self.close_checkpoint()
+        for path in (checkpoint_path, f"{checkpoint_path}-wal", f"{checkpoint_path}-shm"):
+            if os.path.exists(path):
+                os.remove(path)
     
     def print_summary(self, export_type: str):
         """Print export summary"""
@@ -199,6 +497,11 @@ def validate_credentials() -> Dict[str, str]:
     return ExportConfig.get_credentials()
 
 
+def get_checkpoint_filename(output_file: str) -> str:
+    """Generate the checkpoint database filename that belongs to an output file"""
+    return f"{os.path.splitext(output_file)[0]}_ckpt.db"
+
+
 def get_output_filename(export_type: str, timestamp: bool = True) -> str:
     """Generate output filename"""
     if timestamp:
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Test script for the memberships export checkpoint
+
+This script runs the memberships export against a fake ACGI client, interrupts it
+with a failed customer and checks that --resume picks up where it stopped.
+"""
+
+import os
+import sys
+import csv
+import shutil
+import tempfile
+
+# Add current directory to Python path
+sys.path.insert(0, os.path.dirname(__file__))
+
+from export_memberships import MembershipsExporter
+from shared_utils import get_checkpoint_filename
+
+TEST_DIR = '/dev/shm' if os.path.isdir('/dev/shm') else tempfile.gettempdir()
+
+
+class FakeACGIClient:
+    """Returns one membership per customer; customers in failing get an error"""
+    
+    def __init__(self, failing=()):
+        self.failing = set(failing)
+        self.requested = []
+    
+    def get_memberships_data(self, credentials, customer_id):
+        self.requested.append(customer_id)
+        if customer_id in self.failing:
+            return {'success': False, 'message': 'ACGI unavailable'}
+        return {'success': True, 'memberships': {'memberships': [{'subgroupId': f'sg-{customer_id}'}]}}
+
+
+def run_export(acgi_client, input_file, output_file, resume=False):
+    """Run one export with the fake client and no rate limiting"""
+    exporter = MembershipsExporter({})
+    exporter.acgi_client = acgi_client
+    exporter.rate_limiter.acquire = lambda: None
+    try:
+        exporter.export_memberships_to_csv(input_file, output_file=output_file,
+                                           checkpoint_file=get_checkpoint_filename(output_file),
+                                           resume=resume)
+    finally:
+        exporter.close()
+
+
+def read_customer_ids(output_file):
+    with open(output_file, 'r', newline='', encoding='utf-8') as csvfile:
+        return [row['customerId'] for row in csv.DictReader(csvfile)]
+
+
+def test_checkpoint_resume():
+    """An interrupted export resumes into the same file, then drops its checkpoint"""
+    print("=" * 60)
+    print("TESTING MEMBERSHIPS CHECKPOINT RESUME")
+    print("=" * 60)
+    
+    work_dir = tempfile.mkdtemp(prefix='test_memberships_', dir=TEST_DIR)
+    input_file = os.path.join(work_dir, 'contacts.csv')
+    other_input_file = os.path.join(work_dir, 'other_contacts.csv')
+    output_file = os.path.join(work_dir, 'memberships.csv')
+    checkpoint_file = get_checkpoint_filename(output_file)
+    try:
+        with open(input_file, 'w', newline='', encoding='utf-8') as f:
+            f.write('custId\n1\n2\n3\n2\n4\n')
+        with open(other_input_file, 'w', newline='', encoding='utf-8') as f:
+            f.write('custId\n1\n5\n')
+        
+        # Customer 3 fails: its rows are missing and the checkpoint is kept
+        run_export(FakeACGIClient(failing={'3'}), input_file, output_file)
+        assert read_customer_ids(output_file) == ['1', '2', '4']
+        assert os.path.exists(checkpoint_file)
+        print("✓ Failed export keeps its checkpoint")
+        
+        # Resuming only fetches customer 3 and appends to the same file (one header)
+        client = FakeACGIClient()
+        run_export(client, input_file, output_file, resume=True)
+        assert client.requested == ['3']
+        assert read_customer_ids(output_file) == ['1', '2', '4', '3']
+        assert not os.path.exists(checkpoint_file)
+        print("✓ Resumed export completes the file and removes the checkpoint")
+        
+        # Without --resume a leftover checkpoint is ignored
+        run_export(FakeACGIClient(failing={'4'}), input_file, output_file)
+        client = FakeACGIClient()
+        run_export(client, input_file, output_file)
+        assert client.requested == ['1', '2', '3', '4']
+        assert read_customer_ids(output_file) == ['1', '2', '3', '4']
+        print("✓ A fresh export starts over")
+        
+        # A checkpoint recorded for another input file is not resumed
+        run_export(FakeACGIClient(failing={'4'}), input_file, output_file)
+        client = FakeACGIClient()
+        run_export(client, other_input_file, output_file, resume=True)
+        assert client.requested == ['1', '5']
+        assert read_customer_ids(output_file) == ['1', '5']
+        print("✓ Checkpoint of another input file is reset")
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    test_checkpoint_resume()
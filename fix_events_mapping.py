@@ -1,36 +1,31 @@
 #!/usr/bin/env python3
 """
 Script to clear the corrupted events mapping.
+Run this script from the root directory of the project.
 """
 
-import sqlite3
+import sys
 import os
+from sqlalchemy.exc import SQLAlchemyError
+
+# Add the src directory to the Python path
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+from models import EventFieldMapping, session_scope, _bump_mapping_version
 
 def fix_events_mapping():
     """Clear the corrupted events mapping"""
     
-    # Database path
-    db_path = 'local_app.db'
-    
-    if not os.path.exists(db_path):
-        print(f"❌ Database file not found: {db_path}")
-        return False
-    
     try:
-        # Connect to database
-        conn = sqlite3.connect(db_path)
-        cursor = conn.cursor()
-        
         print("🔧 Fixing events mapping...")
         
-        # Clear the corrupted mapping
-        cursor.execute("DELETE FROM event_field_mapping")
-        deleted_count = cursor.rowcount
+        # Clear the corrupted mapping and bump its version in one transaction, so
+        # running processes drop their cached copy
+        with session_scope() as session:
+            deleted_count = session.query(EventFieldMapping).delete(synchronize_session=False)
+            _bump_mapping_version(session, f'{EventFieldMapping.__tablename__}_version')
         print(f"   ✅ Deleted {deleted_count} corrupted mapping records")
         
-        # Commit changes
-        conn.commit()
-        
         print("✅ Events mapping has been cleared!")
         print("🔄 Next steps:")
         print("1. Go to the ACGI to HubSpot tab")
@@ -38,16 +33,13 @@ def fix_events_mapping():
         print("3. Configure the field mappings correctly")
         
         return True
-        
-    except sqlite3.Error as e:
+    
+    except SQLAlchemyError as e:
         print(f"❌ Database error: {e}")
         return False
     except Exception as e:
         print(f"❌ Unexpected error: {e}")
         return False
-    finally:
-        if conn:
-            conn.close()
 
 if __name__ == "__main__":
-    fix_events_mapping() 
\ No newline at end of file
+    fix_events_mapping()
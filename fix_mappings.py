@@ -1,6 +1,6 @@
 import sys
 import os
-import json
+import orjson
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 
 from models import get_session, ContactFieldMapping, MembershipFieldMapping, FormField, AppState
@@ -10,31 +10,37 @@ def fix_mappings():
     try:
         print("=== FIXING MAPPINGS BASED ON CURRENT DATABASE STATE ===")
         
-        # Get current important properties in order
-        important_contacts = session.query(FormField).filter(
-            FormField.object_type == 'contacts',
+        # Get current important properties in order - both object types in one
+        # query, fetching only the columns used (no FormField objects)
+        important_rows = session.query(
+            FormField.object_type, FormField.field_name, FormField.order_index
+        ).filter(
+            FormField.object_type.in_(['contacts', 'memberships']),
             FormField.is_important.in_(['true', True, 1])
         ).order_by(FormField.order_index).all()
         
-        important_memberships = session.query(FormField).filter(
-            FormField.object_type == 'memberships',
-            FormField.is_important.in_(['true', True, 1])
-        ).order_by(FormField.order_index).all()
+        important_contacts = [(name, order) for obj_type, name, order in important_rows
+                              if obj_type == 'contacts']
+        important_memberships = [(name, order) for obj_type, name, order in important_rows
+                                 if obj_type == 'memberships']
         
         print("Current Contact Properties in Order:")
-        for prop in important_contacts:
-            print(f"  {prop.order_index}: {prop.field_name}")
+        for field_name, order_index in important_contacts:
+            print(f"  {order_index}: {field_name}")
         
         print("Current Membership Properties in Order:")
-        for prop in important_memberships:
-            print(f"  {prop.order_index}: {prop.field_name}")
+        for field_name, order_index in important_memberships:
+            print(f"  {order_index}: {field_name}")
         
-        # Get ACGI fields
-        acgi_contact_fields_obj = session.query(AppState).filter_by(key='acgi_fields_contacts').first()
-        acgi_membership_fields_obj = session.query(AppState).filter_by(key='acgi_fields_memberships').first()
+        # Get ACGI fields - both keys in one query
+        acgi_fields = dict(session.query(AppState.key, AppState.value).filter(
+            AppState.key.in_(['acgi_fields_contacts', 'acgi_fields_memberships'])
+        ).all())
+        acgi_contact_value = acgi_fields.get('acgi_fields_contacts')
+        acgi_membership_value = acgi_fields.get('acgi_fields_memberships')
         
-        acgi_contact_fields = json.loads(acgi_contact_fields_obj.value) if acgi_contact_fields_obj else {}
-        acgi_membership_fields = json.loads(acgi_membership_fields_obj.value) if acgi_membership_fields_obj else {}
+        acgi_contact_fields = orjson.loads(acgi_contact_value) if acgi_contact_value else {}
+        acgi_membership_fields = orjson.loads(acgi_membership_value) if acgi_membership_value else {}
         
         print(f"ACGI Contact Fields: {list(acgi_contact_fields.keys())}")
         print(f"ACGI Membership Fields: {list(acgi_membership_fields.keys())}")
@@ -59,23 +65,20 @@ def fix_mappings():
         }
         
         # Generate contact mapping based on current order
-        final_contact_mapping = {}
-        for prop in important_contacts:
-            if prop.field_name in contact_mapping:
-                final_contact_mapping[prop.field_name] = contact_mapping[prop.field_name]
+        final_contact_mapping = {fn: contact_mapping[fn] for fn, _ in important_contacts
+                                 if fn in contact_mapping}
         
         # Generate membership mapping based on current order
-        final_membership_mapping = {}
-        for prop in important_memberships:
-            if prop.field_name in membership_mapping:
-                final_membership_mapping[prop.field_name] = membership_mapping[prop.field_name]
+        final_membership_mapping = {fn: membership_mapping[fn] for fn, _ in important_memberships
+                                    if fn in membership_mapping}
         
-        print(f"\nNew Contact Mapping: {json.dumps(final_contact_mapping, indent=2)}")
-        print(f"New Membership Mapping: {json.dumps(final_membership_mapping, indent=2)}")
+        print(f"\nNew Contact Mapping: {orjson.dumps(final_contact_mapping, option=orjson.OPT_INDENT_2).decode()}")
+        print(f"New Membership Mapping: {orjson.dumps(final_membership_mapping, option=orjson.OPT_INDENT_2).decode()}")
         
-        # Save to database
-        ContactFieldMapping.set_mapping(final_contact_mapping)
-        MembershipFieldMapping.set_mapping(final_membership_mapping)
+        # Save to database - both mappings in one transaction (one commit)
+        ContactFieldMapping.set_mapping(final_contact_mapping, session=session)
+        MembershipFieldMapping.set_mapping(final_membership_mapping, session=session)
+        session.commit()
         
         print("✅ Mappings updated successfully!")
         
@@ -83,8 +86,8 @@ def fix_mappings():
         retrieved_contact = ContactFieldMapping.get_mapping()
         retrieved_membership = MembershipFieldMapping.get_mapping()
         
-        print(f"Retrieved Contact Mapping: {json.dumps(retrieved_contact, indent=2)}")
-        print(f"Retrieved Membership Mapping: {json.dumps(retrieved_membership, indent=2)}")
+        print(f"Retrieved Contact Mapping: {orjson.dumps(retrieved_contact, option=orjson.OPT_INDENT_2).decode()}")
+        print(f"Retrieved Membership Mapping: {orjson.dumps(retrieved_membership, option=orjson.OPT_INDENT_2).decode()}")
         
     finally:
         session.close()
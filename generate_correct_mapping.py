@@ -1,6 +1,6 @@
 import sys
 import os
-import json
+import orjson
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 
 from models import get_session, ContactFieldMapping, MembershipFieldMapping, FormField, AppState
@@ -12,24 +12,29 @@ def generate_correct_mapping():
         
         # CONTACT MAPPING
         print("\n--- CONTACT MAPPING ---")
-        acgi_contact_fields_obj = session.query(AppState).filter_by(key='acgi_fields_contacts').first()
-        if not acgi_contact_fields_obj or not acgi_contact_fields_obj.value:
+        # Both ACGI field sets in one query; memberships are used further down
+        acgi_fields = dict(session.query(AppState.key, AppState.value).filter(
+            AppState.key.in_(['acgi_fields_contacts', 'acgi_fields_memberships'])
+        ).all())
+        acgi_contact_value = acgi_fields.get('acgi_fields_contacts')
+        if not acgi_contact_value:
             print("❌ No ACGI contact fields found")
             return
             
-        acgi_contact_fields = json.loads(acgi_contact_fields_obj.value)
+        acgi_contact_fields = orjson.loads(acgi_contact_value)
         acgi_fields_list = list(acgi_contact_fields.keys())
         print(f"ACGI Contact Fields: {acgi_fields_list}")
         
         # Get important HubSpot properties in order (handle string boolean values)
-        important_contacts = session.query(FormField).filter(
+        # (column-only query: plain tuples, no FormField objects)
+        important_contacts = session.query(FormField.field_name, FormField.order_index).filter(
             FormField.object_type == 'contacts',
             FormField.is_important.in_(['true', True, 1])
         ).order_by(FormField.order_index).all()
         
         print(f"Important Contact Properties ({len(important_contacts)}):")
-        for prop in important_contacts:
-            print(f"  {prop.field_name} (order: {prop.order_index})")
+        for field_name, order_index in important_contacts:
+            print(f"  {field_name} (order: {order_index})")
         
         # Define the correct contact mapping based on the image
         correct_contact_mapping = {
@@ -42,36 +47,33 @@ def generate_correct_mapping():
         }
         
         # Generate contact mapping
-        contact_mapping = {}
-        for hubspot_prop in important_contacts:
-            if hubspot_prop.field_name in correct_contact_mapping:
-                acgi_field = correct_contact_mapping[hubspot_prop.field_name]
-                contact_mapping[hubspot_prop.field_name] = acgi_field
-                print(f"  {hubspot_prop.field_name} -> {acgi_field}")
+        contact_mapping = {fn: correct_contact_mapping[fn] for fn, _ in important_contacts
+                           if fn in correct_contact_mapping}
+        for hubspot_field, acgi_field in contact_mapping.items():
+            print(f"  {hubspot_field} -> {acgi_field}")
         
-        print(f"Contact mapping: {json.dumps(contact_mapping, indent=2)}")
+        print(f"Contact mapping: {orjson.dumps(contact_mapping, option=orjson.OPT_INDENT_2).decode()}")
         
-        # Save contact mapping to database
-        ContactFieldMapping.set_mapping(contact_mapping)
-        print("✅ Contact mapping saved successfully!")
+        # Stage contact mapping; it is committed together with the membership mapping
+        ContactFieldMapping.set_mapping(contact_mapping, session=session)
         
         # MEMBERSHIP MAPPING
         print("\n--- MEMBERSHIP MAPPING ---")
-        acgi_membership_fields_obj = session.query(AppState).filter_by(key='acgi_fields_memberships').first()
-        if acgi_membership_fields_obj and acgi_membership_fields_obj.value:
-            acgi_membership_fields = json.loads(acgi_membership_fields_obj.value)
+        acgi_membership_value = acgi_fields.get('acgi_fields_memberships')
+        if acgi_membership_value:
+            acgi_membership_fields = orjson.loads(acgi_membership_value)
             acgi_membership_fields_list = list(acgi_membership_fields.keys())
             print(f"ACGI Membership Fields: {acgi_membership_fields_list}")
             
             # Get important HubSpot membership properties
-            important_memberships = session.query(FormField).filter(
+            important_memberships = session.query(FormField.field_name, FormField.order_index).filter(
                 FormField.object_type == 'memberships',
                 FormField.is_important.in_(['true', True, 1])
             ).order_by(FormField.order_index).all()
             
             print(f"Important Membership Properties ({len(important_memberships)}):")
-            for prop in important_memberships:
-                print(f"  {prop.field_name} (order: {prop.order_index})")
+            for field_name, order_index in important_memberships:
+                print(f"  {field_name} (order: {order_index})")
             
             # Define the correct membership mapping based on the image
             correct_membership_mapping = {
@@ -83,28 +85,29 @@ def generate_correct_mapping():
             }
             
             # Generate membership mapping
-            membership_mapping = {}
-            for hubspot_prop in important_memberships:
-                if hubspot_prop.field_name in correct_membership_mapping:
-                    acgi_field = correct_membership_mapping[hubspot_prop.field_name]
-                    membership_mapping[hubspot_prop.field_name] = acgi_field
-                    print(f"  {hubspot_prop.field_name} -> {acgi_field}")
+            membership_mapping = {fn: correct_membership_mapping[fn] for fn, _ in important_memberships
+                                  if fn in correct_membership_mapping}
+            for hubspot_field, acgi_field in membership_mapping.items():
+                print(f"  {hubspot_field} -> {acgi_field}")
             
-            print(f"Membership mapping: {json.dumps(membership_mapping, indent=2)}")
+            print(f"Membership mapping: {orjson.dumps(membership_mapping, option=orjson.OPT_INDENT_2).decode()}")
             
-            # Save membership mapping to database
-            MembershipFieldMapping.set_mapping(membership_mapping)
-            print("✅ Membership mapping saved successfully!")
+            # Stage membership mapping
+            MembershipFieldMapping.set_mapping(membership_mapping, session=session)
         else:
             print("❌ No ACGI membership fields found")
             
+        # Save both mappings to database in one transaction
+        session.commit()
+        print("✅ Mappings saved successfully!")
+        
         # Verify both mappings
         print("\n--- VERIFICATION ---")
         retrieved_contact_mapping = ContactFieldMapping.get_mapping()
         retrieved_membership_mapping = MembershipFieldMapping.get_mapping()
         
-        print(f"Retrieved contact mapping: {json.dumps(retrieved_contact_mapping, indent=2)}")
-        print(f"Retrieved membership mapping: {json.dumps(retrieved_membership_mapping, indent=2)}")
+        print(f"Retrieved contact mapping: {orjson.dumps(retrieved_contact_mapping, option=orjson.OPT_INDENT_2).decode()}")
+        print(f"Retrieved membership mapping: {orjson.dumps(retrieved_membership_mapping, option=orjson.OPT_INDENT_2).decode()}")
         
         if contact_mapping == retrieved_contact_mapping:
             print("✅ Contact mapping verification successful!")
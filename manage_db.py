@@ -6,47 +6,79 @@ Database management script for ACGI to HubSpot Integration
 import os
 import sys
 import argparse
+import hashlib
+from functools import lru_cache
 
 # Add src directory to Python path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 
-from models import init_db, reset_db, get_session, User, AppState, FormField, SearchPreference, ContactFieldMapping, Base, engine
+from models import init_db, reset_db, get_session, insert_user, User, AppState, FormField, SearchPreference, ContactFieldMapping, Base, engine
 from sqlalchemy import inspect
+from werkzeug.security import generate_password_hash
 from config import Config
 
+# All required tables from models, in display order
+REQUIRED_TABLES = (
+    'users',
+    'app_state',
+    'form_fields',
+    'search_preferences',
+    'contact_field_mapping',
+    'scheduling_config',
+    'membership_field_mapping',
+    'event_field_mapping',
+    'purchased_products_field_mapping'
+)
+
+# Membership checks against the required tables; REQUIRED_TABLES keeps the display order
+_REQUIRED_TABLES = frozenset(REQUIRED_TABLES)
+
+# Required columns for each table, in the order missing ones are added
+REQUIRED_COLUMNS = {
+    'users': ('id', 'username', 'password_hash', 'created_at', 'last_login'),
+    'app_state': ('key', 'value', 'created_at', 'updated_at'),
+    'form_fields': ('id', 'object_type', 'field_name', 'field_label', 'field_type', 'is_enabled', 'is_important', 'order_index', 'created_at', 'field_source'),
+    'search_preferences': ('id', 'object_type', 'search_strategy', 'created_at', 'updated_at'),
+    'contact_field_mapping': ('id', 'mapping'),
+    'scheduling_config': ('id', 'frequency', 'enabled', 'customer_ids', 'sync_contacts', 'sync_memberships', 'sync_orders', 'sync_events', 'last_sync', 'created_at', 'updated_at', 'production_mode'),
+    'membership_field_mapping': ('id', 'mapping'),
+    'event_field_mapping': ('id', 'mapping'),
+    'purchased_products_field_mapping': ('id', 'mapping')
+}
+
 def get_required_tables():
-    """Get list of all required tables from models"""
-    return [
-        'users',
-        'app_state', 
-        'form_fields',
-        'search_preferences',
-        'contact_field_mapping',
-        'scheduling_config',
-        'membership_field_mapping',
-        'event_field_mapping',
-        'purchased_products_field_mapping'
-    ]
+    """Get tuple of all required tables from models"""
+    return REQUIRED_TABLES
 
 def get_required_columns():
     """Get dictionary of required columns for each table"""
+    return REQUIRED_COLUMNS
+
+@lru_cache(maxsize=None)
+def get_inspector():
+    """Shared inspector, so its info_cache serves repeated reflection across status and check"""
+    return inspect(engine)
+
+# AppState key holding the fingerprint of the last schema that passed the column check
+SCHEMA_FINGERPRINT_KEY = 'schema_fingerprint'
+
+def get_required_indexes():
+    """Get dictionary of the indexes declared on the models (name -> Index) for each table"""
     return {
-        'users': ['id', 'username', 'password_hash', 'created_at', 'last_login'],
-        'app_state': ['id', 'key', 'value', 'created_at', 'updated_at'],
-        'form_fields': ['id', 'object_type', 'field_name', 'field_label', 'field_type', 'is_enabled', 'is_important', 'order_index', 'created_at', 'field_source'],
-        'search_preferences': ['id', 'object_type', 'search_strategy', 'created_at', 'updated_at'],
-        'contact_field_mapping': ['id', 'mapping'],
-        'scheduling_config': ['id', 'frequency', 'enabled', 'customer_ids', 'sync_contacts', 'sync_memberships', 'sync_orders', 'sync_events', 'last_sync', 'created_at', 'updated_at', 'production_mode'],
-        'membership_field_mapping': ['id', 'mapping'],
-        'event_field_mapping': ['id', 'mapping'],
-        'purchased_products_field_mapping': ['id', 'mapping']
+        table.name: {index.name: index for index in table.indexes}
+        for table in Base.metadata.sorted_tables if table.indexes
     }
 
-def check_table_columns(inspector, table_name, required_columns):
-    """Check if a table has all required columns"""
+@lru_cache(maxsize=None)
+def get_schema_fingerprint():
+    """Hash of the required tables, columns and indexes, used to skip checks when nothing changed"""
+    columns = tuple(sorted((table, tuple(sorted(cols))) for table, cols in get_required_columns().items()))
+    indexes = tuple(sorted((table, tuple(sorted(idx))) for table, idx in get_required_indexes().items()))
+    return hashlib.sha256(repr((columns, indexes)).encode()).hexdigest()
+
+def check_table_columns(table_name, existing_columns, required_columns):
+    """Check if a table has all required columns (existing_columns: set of reflected names)"""
     try:
-        columns = inspector.get_columns(table_name)
-        existing_columns = [col['name'] for col in columns]
         missing_columns = [col for col in required_columns if col not in existing_columns]
         
         if missing_columns:
@@ -60,103 +92,106 @@ def check_table_columns(inspector, table_name, required_columns):
         return False, []
 
 def fix_missing_columns(table_name, missing_columns):
-    """Add missing columns to a table"""
+    """Add missing columns to a table in one transaction"""
     try:
-        from sqlalchemy import text
-        
-        # Get the engine
-        from models import engine
+        # Determine column types based on column name and table
+        table_types = _COLUMN_TYPES.get(table_name, _NO_COLUMN_TYPES)
+        add_clauses = []
+        for column in missing_columns:
+            column_type = table_types.get(column, 'TEXT')
+            print(f"      Adding column: {column} ({column_type})")
+            add_clauses.append(f"ADD COLUMN {column} {column_type}")
         
-        with engine.connect() as conn:
-            for column in missing_columns:
-                # Determine column type based on column name and table
-                column_type = get_column_type(table_name, column)
-                sql = f"ALTER TABLE {table_name} ADD COLUMN {column} {column_type}"
-                print(f"      Adding column: {column} ({column_type})")
-                conn.execute(text(sql))
-            conn.commit()
+        with engine.begin() as conn:
+            if engine.dialect.name == 'sqlite':
+                # SQLite allows only one ADD COLUMN per ALTER TABLE
+                for clause in add_clauses:
+                    conn.exec_driver_sql(f"ALTER TABLE {table_name} {clause}")
+            else:
+                conn.exec_driver_sql(f"ALTER TABLE {table_name} {', '.join(add_clauses)}")
+        # Reflection cached before the ALTER is stale now
+        get_inspector().clear_cache()
         return True
     except Exception as e:
-        print(f"      ❌ Error adding column {column}: {str(e)}")
+        print(f"      ❌ Error adding columns to {table_name}: {str(e)}")
         return False
 
-def get_column_type(table_name, column_name):
-    """Determine the appropriate column type based on table and column name"""
-    # Default to TEXT for most cases
-    column_types = {
-        'users': {
-            'id': 'INTEGER PRIMARY KEY',
-            'username': 'VARCHAR(50)',
-            'password_hash': 'VARCHAR(255)',
-            'created_at': 'DATETIME',
-            'last_login': 'DATETIME'
-        },
-        'app_state': {
-            'id': 'INTEGER PRIMARY KEY',
-            'key': 'VARCHAR(100)',
-            'value': 'TEXT',
-            'created_at': 'DATETIME',
-            'updated_at': 'DATETIME'
-        },
-        'form_fields': {
-            'id': 'INTEGER PRIMARY KEY',
-            'object_type': 'VARCHAR(50)',
-            'field_name': 'VARCHAR(100)',
-            'field_label': 'VARCHAR(200)',
-            'field_type': 'VARCHAR(50)',
-            'is_enabled': 'VARCHAR(10)',
-            'is_important': 'VARCHAR(10)',
-            'order_index': 'INTEGER',
-            'created_at': 'DATETIME',
-            'field_source': 'VARCHAR(20)'
-        },
-        'search_preferences': {
-            'id': 'INTEGER PRIMARY KEY',
-            'object_type': 'VARCHAR(50)',
-            'search_strategy': 'VARCHAR(50)',
-            'created_at': 'DATETIME',
-            'updated_at': 'DATETIME'
-        },
-        'contact_field_mapping': {
-            'id': 'INTEGER PRIMARY KEY',
-            'mapping': 'TEXT'
-        },
-        'scheduling_config': {
-            'id': 'INTEGER PRIMARY KEY',
-            'frequency': 'INTEGER',
-            'enabled': 'VARCHAR(10)',
-            'customer_ids': 'TEXT',
-            'sync_contacts': 'VARCHAR(10)',
-            'sync_memberships': 'VARCHAR(10)',
-            'sync_orders': 'VARCHAR(10)',
-            'sync_events': 'VARCHAR(10)',
-            'last_sync': 'DATETIME',
-            'created_at': 'DATETIME',
-            'updated_at': 'DATETIME'
-        },
-        'membership_field_mapping': {
-            'id': 'INTEGER PRIMARY KEY',
-            'mapping': 'TEXT'
-        },
-        'event_field_mapping': {
-            'id': 'INTEGER PRIMARY KEY',
-            'mapping': 'TEXT'
-        },
-        'purchased_products_field_mapping': {
-            'id': 'INTEGER PRIMARY KEY',
-            'mapping': 'TEXT'
-        }
+# SQL column types used when adding missing columns; anything not listed is TEXT
+_COLUMN_TYPES = {
+    'users': {
+        'id': 'INTEGER PRIMARY KEY',
+        'username': 'VARCHAR(50)',
+        'password_hash': 'VARCHAR(255)',
+        'created_at': 'DATETIME',
+        'last_login': 'DATETIME'
+    },
+    'app_state': {
+        'key': 'VARCHAR(100)',
+        'value': 'TEXT',
+        'created_at': 'DATETIME',
+        'updated_at': 'DATETIME'
+    },
+    'form_fields': {
+        'id': 'INTEGER PRIMARY KEY',
+        'object_type': 'VARCHAR(50)',
+        'field_name': 'VARCHAR(100)',
+        'field_label': 'VARCHAR(200)',
+        'field_type': 'VARCHAR(50)',
+        'is_enabled': 'VARCHAR(10)',
+        'is_important': 'VARCHAR(10)',
+        'order_index': 'INTEGER',
+        'created_at': 'DATETIME',
+        'field_source': 'VARCHAR(20)'
+    },
+    'search_preferences': {
+        'id': 'INTEGER PRIMARY KEY',
+        'object_type': 'VARCHAR(50)',
+        'search_strategy': 'VARCHAR(50)',
+        'created_at': 'DATETIME',
+        'updated_at': 'DATETIME'
+    },
+    'contact_field_mapping': {
+        'id': 'INTEGER PRIMARY KEY',
+        'mapping': 'TEXT'
+    },
+    'scheduling_config': {
+        'id': 'INTEGER PRIMARY KEY',
+        'frequency': 'INTEGER',
+        'enabled': 'VARCHAR(10)',
+        'customer_ids': 'TEXT',
+        'sync_contacts': 'VARCHAR(10)',
+        'sync_memberships': 'VARCHAR(10)',
+        'sync_orders': 'VARCHAR(10)',
+        'sync_events': 'VARCHAR(10)',
+        'last_sync': 'DATETIME',
+        'created_at': 'DATETIME',
+        'updated_at': 'DATETIME'
+    },
+    'membership_field_mapping': {
+        'id': 'INTEGER PRIMARY KEY',
+        'mapping': 'TEXT'
+    },
+    'event_field_mapping': {
+        'id': 'INTEGER PRIMARY KEY',
+        'mapping': 'TEXT'
+    },
+    'purchased_products_field_mapping': {
+        'id': 'INTEGER PRIMARY KEY',
+        'mapping': 'TEXT'
     }
-    
-    return column_types.get(table_name, {}).get(column_name, 'TEXT')
+}
+
+_NO_COLUMN_TYPES = {}
 
-def check_and_create_tables():
-    """Check existence of all tables and columns, create/fix missing ones"""
+def check_and_create_tables(force=False):
+    """Check existence of all tables and columns, create/fix missing ones
+    
+    The column check is skipped when the schema fingerprint stored in AppState
+    matches the current one, unless force is set.
+    """
     try:
-        from models import engine
-        
-        inspector = inspect(engine)
-        existing_tables = inspector.get_table_names()
+        inspector = get_inspector()
+        existing_tables = set(inspector.get_table_names())
         required_tables = get_required_tables()
         required_columns = get_required_columns()
         
@@ -164,67 +199,49 @@ def check_and_create_tables():
         print(f"   Required tables: {len(required_tables)}")
         print(f"   Existing tables: {len(existing_tables)}")
         
-        missing_tables = []
-        existing_required_tables = []
-        tables_with_missing_columns = []
+        # Check tables first (set lookups; required order kept for output)
+        existing_required_tables = [table for table in required_tables if table in existing_tables]
+        missing_tables = [table for table in required_tables if table not in existing_tables]
         
-        # Check tables first
         for table in required_tables:
-            if table in existing_tables:
-                existing_required_tables.append(table)
-                print(f"   ✅ {table}")
-            else:
-                missing_tables.append(table)
-                print(f"   ❌ {table} (missing)")
+            print(f"   ✅ {table}" if table in existing_tables else f"   ❌ {table} (missing)")
         
         # Create missing tables
         if missing_tables:
             print(f"\n📝 Creating {len(missing_tables)} missing tables...")
             try:
-                Base.metadata.create_all(engine, checkfirst=True)
+                # Only the tables known to be missing, without a has_table() probe per table
+                Base.metadata.create_all(
+                    engine,
+                    tables=[Base.metadata.tables[t] for t in missing_tables if t in Base.metadata.tables],
+                    checkfirst=False
+                )
+                inspector.clear_cache()
                 print("✅ All missing tables created successfully!")
-                
-                # Create default admin user after table creation
-                create_default_admin()
-                
             except Exception as e:
                 print(f"❌ Error creating missing tables: {str(e)}")
                 return False
         else:
             print("\n✅ All required tables exist!")
         
-        # Check columns in existing tables
-        print("\n🔍 Checking table columns...")
-        for table in existing_required_tables:
-            if table in required_columns:
-                is_valid, missing_cols = check_table_columns(inspector, table, required_columns[table])
-                if not is_valid:
-                    tables_with_missing_columns.append((table, missing_cols))
-        
-        # Fix missing columns
-        if tables_with_missing_columns:
-            print(f"\n🔧 Fixing {len(tables_with_missing_columns)} tables with missing columns...")
-            for table_name, missing_columns in tables_with_missing_columns:
-                print(f"   📝 Fixing {table_name}...")
-                if fix_missing_columns(table_name, missing_columns):
-                    print(f"   ✅ {table_name} columns fixed successfully!")
-                else:
-                    print(f"   ❌ Failed to fix {table_name} columns!")
-        else:
-            print("\n✅ All table columns are correct!")
-        
-        # Check for admin user
         session = get_session()
         try:
-            admin_user = session.query(User).filter_by(username=Config.ADMIN_USERNAME).first()
-            if admin_user:
-                print(f"   ✅ Admin user exists: {Config.ADMIN_USERNAME}")
+            fingerprint = get_schema_fingerprint()
+            stored = session.query(AppState.value).filter_by(key=SCHEMA_FINGERPRINT_KEY).scalar()
+            if not force and not missing_tables and stored == fingerprint:
+                print("\n✅ Schema unchanged since last check, skipping column check")
             else:
-                print(f"   ❌ Admin user missing: {Config.ADMIN_USERNAME}")
-                print("   📝 Creating admin user...")
-                create_default_admin()
+                columns_ok = check_and_fix_columns(inspector, existing_required_tables, required_columns)
+                indexes_ok = check_and_fix_indexes(inspector, existing_required_tables)
+                # Tables created this run were not column-checked, so only record
+                # the fingerprint once every required table has been checked
+                if columns_ok and indexes_ok and not missing_tables:
+                    _save_schema_fingerprint(session, fingerprint)
         finally:
             session.close()
+        
+        # Check for admin user (created if missing)
+        create_default_admin()
             
         return True
         
@@ -232,25 +249,103 @@ def check_and_create_tables():
         print(f"❌ Error checking database: {str(e)}")
         return False
 
+def check_and_fix_columns(inspector, tables, required_columns):
+    """Check the columns of existing tables and add missing ones; True if all columns are now present"""
+    tables_with_missing_columns = []
+    all_fixed = True
+    
+    # Check columns in existing tables - reflected for all tables in one call
+    print("\n🔍 Checking table columns...")
+    existing_columns = {
+        table: {col['name'] for col in columns}
+        for (_, table), columns in inspector.get_multi_columns(filter_names=tables).items()
+    }
+    for table in tables:
+        if table in required_columns:
+            is_valid, missing_cols = check_table_columns(
+                table, existing_columns.get(table, set()), required_columns[table]
+            )
+            if not is_valid:
+                tables_with_missing_columns.append((table, missing_cols))
+    
+    # Fix missing columns
+    if tables_with_missing_columns:
+        print(f"\n🔧 Fixing {len(tables_with_missing_columns)} tables with missing columns...")
+        for table_name, missing_columns in tables_with_missing_columns:
+            print(f"   📝 Fixing {table_name}...")
+            if fix_missing_columns(table_name, missing_columns):
+                print(f"   ✅ {table_name} columns fixed successfully!")
+            else:
+                print(f"   ❌ Failed to fix {table_name} columns!")
+                all_fixed = False
+    else:
+        print("\n✅ All table columns are correct!")
+    
+    return all_fixed
+
+def check_and_fix_indexes(inspector, tables):
+    """Create model-declared indexes missing from existing tables; True if all are now present"""
+    required_indexes = get_required_indexes()
+    tables = [table for table in tables if table in required_indexes]
+    if not tables:
+        return True
+    
+    print("\n🔍 Checking table indexes...")
+    existing_indexes = {
+        table: {index['name'] for index in indexes}
+        for (_, table), indexes in inspector.get_multi_indexes(filter_names=tables).items()
+    }
+    all_present = True
+    created = False
+    for table in tables:
+        for name, index in required_indexes[table].items():
+            if name in existing_indexes.get(table, set()):
+                continue
+            print(f"   📝 Creating index {name} on {table}...")
+            try:
+                index.create(engine)
+                created = True
+                print(f"   ✅ {name} created")
+            except Exception as e:
+                # e.g. a unique index over rows that already hold duplicates
+                all_present = False
+                print(f"   ❌ Error creating index {name}: {str(e)}")
+    
+    if created:
+        inspector.clear_cache()
+    elif all_present:
+        print("✅ All table indexes present")
+    return all_present
+
+def _save_schema_fingerprint(session, fingerprint):
+    """Store the schema fingerprint in AppState after a successful column check"""
+    try:
+        state = session.query(AppState).filter_by(key=SCHEMA_FINGERPRINT_KEY).first()
+        if state:
+            state.value = fingerprint
+        else:
+            session.add(AppState(key=SCHEMA_FINGERPRINT_KEY, value=fingerprint))
+        session.commit()
+    except Exception as e:
+        session.rollback()
+        print(f"   ⚠️ Could not save schema fingerprint: {str(e)}")
+
 def create_default_admin():
     """Create default admin user if it doesn't exist"""
     try:
-        from werkzeug.security import generate_password_hash
-        
         session = get_session()
         try:
-            # Check if admin user exists
-            admin_user = session.query(User).filter_by(username=Config.ADMIN_USERNAME).first()
-            if not admin_user:
-                # Create default admin user
-                password_hash = generate_password_hash(Config.ADMIN_PASSWORD)
-                admin_user = User(
-                    username=Config.ADMIN_USERNAME,
-                    password_hash=password_hash
-                )
-                session.add(admin_user)
+            # Check if admin user exists (before paying for the password hash)
+            admin_exists = session.query(User.id).filter_by(username=Config.ADMIN_USERNAME).scalar()
+            if not admin_exists:
+                # Create default admin user; a concurrent insert just makes this a no-op
+                password_hash = generate_password_hash(Config.ADMIN_PASSWORD, method=Config.ADMIN_PW_METHOD)
+                created = insert_user(session, Config.ADMIN_USERNAME, password_hash)
                 session.commit()
-                print(f"   ✅ Created default admin user: {Config.ADMIN_USERNAME}")
+                if created:
+                    print(f"   ✅ Created default admin user: {Config.ADMIN_USERNAME}")
+                else:
+                    print(f"   ✅ Admin user already exists: {Config.ADMIN_USERNAME}")
             else:
                 print(f"   ✅ Admin user already exists: {Config.ADMIN_USERNAME}")
         except Exception as e:
@@ -264,10 +359,9 @@ def create_default_admin():
 def check_db_status():
     """Check database status and list tables"""
     try:
-        from models import engine
-        
-        inspector = inspect(engine)
+        inspector = get_inspector()
         tables = inspector.get_table_names()
+        existing_tables = set(tables)
         required_tables = get_required_tables()
         
         print("🗄️ Database Status:")
@@ -278,13 +372,13 @@ def check_db_status():
         if tables:
             print("   All Tables:")
             for table in tables:
-                status = "✅" if table in required_tables else "📋"
+                status = "✅" if table in _REQUIRED_TABLES else "📋"
                 print(f"     {status} {table}")
         else:
             print("   No tables found")
         
         # Check required tables specifically
-        missing_tables = [table for table in required_tables if table not in tables]
+        missing_tables = [table for table in required_tables if table not in existing_tables]
         if missing_tables:
             print(f"\n   ❌ Missing Required Tables: {missing_tables}")
         else:
@@ -293,8 +387,8 @@ def check_db_status():
         # Check for admin user
         session = get_session()
         try:
-            admin_user = session.query(User).filter_by(username=Config.ADMIN_USERNAME).first()
-            if admin_user:
+            admin_exists = session.query(User.id).filter_by(username=Config.ADMIN_USERNAME).scalar()
+            if admin_exists:
                 print(f"   ✅ Admin user exists: {Config.ADMIN_USERNAME}")
             else:
                 print(f"   ❌ Admin user missing: {Config.ADMIN_USERNAME}")
@@ -304,10 +398,13 @@ def check_db_status():
     except Exception as e:
         print(f"❌ Error checking database: {str(e)}")
 
-def reset_database():
-    """Reset the database - drop all tables and recreate them"""
+def reset_database(assume_yes=False):
+    """Reset the database - drop all tables and recreate them (assume_yes skips the prompt)"""
     print("⚠️  WARNING: This will delete all data!")
-    confirm = input("Are you sure you want to reset the database? (yes/no): ")
+    if assume_yes:
+        confirm = 'yes'
+    else:
+        confirm = input("Are you sure you want to reset the database? (yes/no): ")
     
     if confirm.lower() == 'yes':
         print("🗄️ Resetting database...")
@@ -328,6 +425,10 @@ def main():
     parser = argparse.ArgumentParser(description='Database management for ACGI to HubSpot Integration')
     parser.add_argument('action', choices=['status', 'init', 'reset', 'check'], 
                        help='Action to perform: status (show db status), init (initialize), reset (reset all data), check (check and fix tables/columns)')
+    parser.add_argument('--force', action='store_true',
+                       help='check: check columns even if the schema is unchanged since the last check')
+    parser.add_argument('-y', '--yes', action='store_true',
+                       help='reset: skip the confirmation prompt (for non-interactive runs)')
     
     args = parser.parse_args()
     
@@ -336,9 +437,9 @@ def main():
     elif args.action == 'init':
         init_database()
     elif args.action == 'reset':
-        reset_database()
+        reset_database(assume_yes=args.yes)
     elif args.action == 'check':
-        check_and_create_tables()
+        check_and_create_tables(force=args.force)
         
 
 if __name__ == "__main__":
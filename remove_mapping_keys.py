@@ -6,12 +6,45 @@ Run this script from the root directory of the project.
 
 import sys
 import os
-import json
+import orjson
 
 # Add the src directory to the Python path
 sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
 
-from src.models import get_session, AppState
+from models import get_session, AppState
+
+ACGI_CONFIG_KEYS = ('acgi_field_config_contacts', 'acgi_field_config_memberships')
+
+def _remove_keys_from_config(acgi_config_obj, object_type, keys_to_remove):
+    """
+    Remove keys from one AppState ACGI field config row and report what changed.
+    
+    Returns:
+        dict: The updated config, or None if the row was not changed
+    """
+    if not acgi_config_obj or not acgi_config_obj.value:
+        print(f"No {object_type} ACGI config found in AppState")
+        return None
+    
+    acgi_config = orjson.loads(acgi_config_obj.value)
+    print(f"Current {object_type} ACGI config: {acgi_config}")
+    
+    # Remove specified keys in one pass over the config
+    drop = frozenset(keys_to_remove)
+    removed_keys = drop & acgi_config.keys()
+    for key in keys_to_remove:
+        if key in removed_keys:
+            print(f"Removed key '{key}' from {object_type} ACGI config")
+        else:
+            print(f"Key '{key}' not found in {object_type} ACGI config")
+    
+    if not removed_keys:
+        print(f"No keys were removed from {object_type} ACGI config")
+        return None
+    
+    acgi_config = {k: v for k, v in acgi_config.items() if k not in drop}
+    print(f"Updated {object_type} ACGI config: {acgi_config}")
+    return acgi_config
 
 def remove_keys_from_appstate_mapping(keys_to_remove, object_type='both'):
     """
@@ -20,105 +53,73 @@ def remove_keys_from_appstate_mapping(keys_to_remove, object_type='both'):
     Args:
         keys_to_remove (list): List of keys to remove from the mapping
         object_type (str): 'contacts', 'memberships', or 'both' (default)
+    
+    Returns:
+        dict: Both ACGI field config values (JSON text or None) after the update,
+        or None on error
     """
     session = get_session()
     
     try:
-        if object_type in ['contacts', 'both']:
-            print(f"Processing contacts ACGI field config...")
-            
-            # Get current ACGI field config from AppState
-            acgi_config_key = f'acgi_field_config_contacts'
-            acgi_config_obj = session.query(AppState).filter_by(key=acgi_config_key).first()
-            
-            if acgi_config_obj and acgi_config_obj.value:
-                acgi_config = json.loads(acgi_config_obj.value)
-                print(f"Current contacts ACGI config: {acgi_config}")
-                
-                # Remove specified keys
-                removed_keys = []
-                for key in keys_to_remove:
-                    if key in acgi_config:
-                        del acgi_config[key]
-                        removed_keys.append(key)
-                        print(f"Removed key '{key}' from contacts ACGI config")
-                    else:
-                        print(f"Key '{key}' not found in contacts ACGI config")
-                
-                if removed_keys:
-                    # Save updated config
-                    acgi_config_obj.value = json.dumps(acgi_config)
-                    session.commit()
-                    print(f"Updated contacts ACGI config: {acgi_config}")
-                else:
-                    print("No keys were removed from contacts ACGI config")
-            else:
-                print("No contacts ACGI config found in AppState")
+        object_types = ['contacts', 'memberships'] if object_type == 'both' else [object_type]
         
-        if object_type in ['memberships', 'both']:
-            print(f"\nProcessing memberships ACGI field config...")
-            
-            # Get current ACGI field config from AppState
-            acgi_config_key = f'acgi_field_config_memberships'
-            acgi_config_obj = session.query(AppState).filter_by(key=acgi_config_key).first()
-            
-            if acgi_config_obj and acgi_config_obj.value:
-                acgi_config = json.loads(acgi_config_obj.value)
-                print(f"Current memberships ACGI config: {acgi_config}")
-                
-                # Remove specified keys
-                removed_keys = []
-                for key in keys_to_remove:
-                    if key in acgi_config:
-                        del acgi_config[key]
-                        removed_keys.append(key)
-                        print(f"Removed key '{key}' from memberships ACGI config")
-                    else:
-                        print(f"Key '{key}' not found in memberships ACGI config")
-                
-                if removed_keys:
-                    # Save updated config
-                    acgi_config_obj.value = json.dumps(acgi_config)
-                    session.commit()
-                    print(f"Updated memberships ACGI config: {acgi_config}")
-                else:
-                    print("No keys were removed from memberships ACGI config")
-            else:
-                print("No memberships ACGI config found in AppState")
+        # Get both ACGI field configs from AppState in one query, so the caller
+        # can show the result without reading them again
+        config_objs = {obj.key: obj for obj in
+                       session.query(AppState).filter(AppState.key.in_(ACGI_CONFIG_KEYS)).all()}
+        configs = {key: config_objs[key].value if key in config_objs else None for key in ACGI_CONFIG_KEYS}
+        
+        updated = {}
+        for t in object_types:
+            prefix = '\n' if t == 'memberships' else ''
+            print(f"{prefix}Processing {t} ACGI field config...")
+            config_key = f'acgi_field_config_{t}'
+            acgi_config = _remove_keys_from_config(config_objs.get(config_key), t, keys_to_remove)
+            if acgi_config is not None:
+                updated[config_key] = acgi_config
+        
+        # Save updated configs in one commit
+        if updated:
+            for config_key, acgi_config in updated.items():
+                # value is a TEXT column
+                configs[config_key] = config_objs[config_key].value = orjson.dumps(acgi_config).decode()
+            session.commit()
         
         print("\n✅ AppState mapping cleanup completed successfully!")
         
     except Exception as e:
         session.rollback()
         print(f"❌ Error: {str(e)}")
-        return False
+        return None
     finally:
         session.close()
     
-    return True
+    return configs
 
-def show_current_appstate_mappings():
-    """Display current AppState mappings for both contacts and memberships."""
+def show_current_appstate_mappings(configs=None):
+    """
+    Display current AppState mappings for both contacts and memberships.
+    
+    Args:
+        configs (dict): Config key -> JSON value already in hand; read from AppState if not given
+    """
     session = get_session()
     
     try:
         print("=== CURRENT APPSTATE MAPPINGS ===")
         
-        # Show contacts ACGI config
-        contacts_config_obj = session.query(AppState).filter_by(key='acgi_field_config_contacts').first()
-        if contacts_config_obj and contacts_config_obj.value:
-            contacts_config = json.loads(contacts_config_obj.value)
-            print(f"Contacts ACGI Config: {contacts_config}")
-        else:
-            print("Contacts ACGI Config: None")
+        # Both ACGI configs in one query
+        if configs is None:
+            configs = dict(session.query(AppState.key, AppState.value).filter(
+                AppState.key.in_(ACGI_CONFIG_KEYS)
+            ).all())
         
-        # Show memberships ACGI config
-        memberships_config_obj = session.query(AppState).filter_by(key='acgi_field_config_memberships').first()
-        if memberships_config_obj and memberships_config_obj.value:
-            memberships_config = json.loads(memberships_config_obj.value)
-            print(f"Memberships ACGI Config: {memberships_config}")
-        else:
-            print("Memberships ACGI Config: None")
+        for object_type, label in (('contacts', 'Contacts'), ('memberships', 'Memberships')):
+            value = configs.get(f'acgi_field_config_{object_type}')
+            if value:
+                print(f"{label} ACGI Config: {orjson.loads(value)}")
+            else:
+                print(f"{label} ACGI Config: None")
         
         print("==================================")
         
@@ -169,11 +170,11 @@ def main():
     confirm = input(f"\nAre you sure you want to remove these keys from {object_type} AppState config? (y/N): ").strip().lower()
     
     if confirm in ['y', 'yes']:
-        success = remove_keys_from_appstate_mapping(keys_to_remove, object_type)
-        if success:
+        configs = remove_keys_from_appstate_mapping(keys_to_remove, object_type)
+        if configs is not None:
             print("\n✅ Operation completed successfully!")
             print("\nUpdated AppState configs:")
-            show_current_appstate_mappings()
+            show_current_appstate_mappings(configs)
         else:
             print("\n❌ Operation failed!")
     else:
@@ -4,9 +4,43 @@ Script to reset data for a specific object type in the CFMA integration.
 This will clear all mapping data, field configurations, and related data for the specified object type.
 """
 
+import argparse
+import contextlib
+import json
 import sqlite3
 import sys
 import os
+import uuid
+from functools import lru_cache
+
+# Mapping table (and its model name) for each object type
+MAPPING_TABLES = {
+    'contacts': ('contact_field_mapping', 'ContactFieldMapping'),
+    'memberships': ('membership_field_mapping', 'MembershipFieldMapping'),
+    'purchased_products': ('purchased_products_field_mapping', 'PurchasedProductsFieldMapping'),
+    'events': ('event_field_mapping', 'EventFieldMapping'),
+}
+
+# Fixed SQL text, so sqlite3's statement cache reuses the prepared statements
+DELETE_FORM_FIELDS_SQL = "DELETE FROM form_fields WHERE object_type = ?"
+DELETE_APP_STATE_KEYS_SQL = "DELETE FROM app_state WHERE key IN ({placeholders})"
+DELETE_SEARCH_PREFERENCES_SQL = "DELETE FROM search_preferences WHERE object_type = ?"
+# Bumping '<table>_version' makes running processes drop their cached mapping (see models._bump_mapping_version)
+BUMP_MAPPING_VERSION_SQL = "UPDATE app_state SET value = ?, updated_at = CURRENT_TIMESTAMP WHERE key = ?"
+INSERT_MAPPING_VERSION_SQL = ("INSERT INTO app_state (key, value, created_at, updated_at) "
+                              "VALUES (?, ?, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP)")
+
+# AppState preference keys that are only reset with contacts
+ACGI_PREFERENCE_KEYS = ('acgi_email_preference', 'acgi_phone_preference', 'acgi_address_preference')
+
+@lru_cache(maxsize=None)
+def get_connection(db_path):
+    """Open the SQLite database once per process and reuse the connection across resets"""
+    conn = sqlite3.connect(db_path)
+    # WAL + synchronous=NORMAL: no fsync of the main database file on commit
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    return conn
 
 def reset_object_data(object_type):
     """
@@ -31,77 +65,57 @@ def reset_object_data(object_type):
         return False
     
     try:
-        # Connect to database
-        conn = sqlite3.connect(db_path)
+        # Connect to database (reused if already open)
+        conn = get_connection(db_path)
         cursor = conn.cursor()
         
         print(f"🔄 Resetting data for object type: {object_type}")
         print("=" * 50)
         
-        # 1. Delete FormField records for the object type
-        print(f"1. Deleting FormField records for '{object_type}'...")
-        cursor.execute("DELETE FROM form_fields WHERE object_type = ?", (object_type,))
-        form_fields_deleted = cursor.rowcount
-        print(f"   ✅ Deleted {form_fields_deleted} FormField records")
-        
-        # 2. Delete AppState records for ACGI field config
-        print(f"2. Deleting AppState ACGI field config for '{object_type}'...")
-        cursor.execute("DELETE FROM app_state WHERE key = ?", (f'acgi_field_config_{object_type}',))
-        acgi_config_deleted = cursor.rowcount
-        print(f"   ✅ Deleted {acgi_config_deleted} AppState ACGI config records")
-        
-        # 3. Delete AppState records for ACGI fields
-        print(f"3. Deleting AppState ACGI fields for '{object_type}'...")
-        cursor.execute("DELETE FROM app_state WHERE key = ?", (f'acgi_fields_{object_type}',))
-        acgi_fields_deleted = cursor.rowcount
-        print(f"   ✅ Deleted {acgi_fields_deleted} AppState ACGI fields records")
-        
-        # 4. Delete field mapping records based on object type
-        if object_type == 'contacts':
-            print("4. Deleting ContactFieldMapping records...")
-            cursor.execute("DELETE FROM contact_field_mapping")
-            mapping_deleted = cursor.rowcount
-            print(f"   ✅ Deleted {mapping_deleted} ContactFieldMapping records")
+        # All deletes run in one transaction: committed together, or rolled back on error
+        with conn:
+            # Take the write lock up front rather than on the first DELETE
+            cursor.execute("BEGIN IMMEDIATE")
             
-        elif object_type == 'memberships':
-            print("4. Deleting MembershipFieldMapping records...")
-            cursor.execute("DELETE FROM membership_field_mapping")
-            mapping_deleted = cursor.rowcount
-            print(f"   ✅ Deleted {mapping_deleted} MembershipFieldMapping records")
+            # 1. Delete FormField records for the object type
+            print(f"1. Deleting FormField records for '{object_type}'...")
+            cursor.execute(DELETE_FORM_FIELDS_SQL, (object_type,))
+            form_fields_deleted = cursor.rowcount
+            print(f"   ✅ Deleted {form_fields_deleted} FormField records")
             
-        elif object_type == 'purchased_products':
-            print("4. Deleting PurchasedProductsFieldMapping records...")
-            cursor.execute("DELETE FROM purchased_products_field_mapping")
-            mapping_deleted = cursor.rowcount
-            print(f"   ✅ Deleted {mapping_deleted} PurchasedProductsFieldMapping records")
+            # 2. Delete AppState records (ACGI field config, ACGI fields and, for
+            # contacts, the ACGI preferences) in one statement
+            app_state_keys = [f'acgi_field_config_{object_type}', f'acgi_fields_{object_type}']
+            app_state_label = "ACGI field config and fields"
+            if object_type == 'contacts':
+                app_state_keys.extend(ACGI_PREFERENCE_KEYS)
+                app_state_label = "ACGI field config, fields and preferences"
+            print(f"2. Deleting AppState {app_state_label} for '{object_type}'...")
+            cursor.execute(DELETE_APP_STATE_KEYS_SQL.format(placeholders=', '.join('?' * len(app_state_keys))),
+                           app_state_keys)
+            app_state_deleted = cursor.rowcount
+            print(f"   ✅ Deleted {app_state_deleted} AppState records")
             
-        elif object_type == 'events':
-            print("4. Deleting EventFieldMapping records...")
-            cursor.execute("DELETE FROM event_field_mapping")
+            # 3. Delete field mapping records for the object type
+            mapping_table, mapping_model = MAPPING_TABLES[object_type]
+            print(f"3. Deleting {mapping_model} records...")
+            cursor.execute(f"DELETE FROM {mapping_table}")
             mapping_deleted = cursor.rowcount
-            print(f"   ✅ Deleted {mapping_deleted} EventFieldMapping records")
-        
-        # 5. Delete SearchPreference records for the object type
-        print(f"5. Deleting SearchPreference records for '{object_type}'...")
-        cursor.execute("DELETE FROM search_preferences WHERE object_type = ?", (object_type,))
-        search_pref_deleted = cursor.rowcount
-        print(f"   ✅ Deleted {search_pref_deleted} SearchPreference records")
-        
-        # 6. Delete ACGI preference records for contacts
-        if object_type == 'contacts':
-            print("6. Deleting ACGI preference records for contacts...")
-            cursor.execute("DELETE FROM app_state WHERE key IN (?, ?, ?)", 
-                         ('acgi_email_preference', 'acgi_phone_preference', 'acgi_address_preference'))
-            pref_deleted = cursor.rowcount
-            print(f"   ✅ Deleted {pref_deleted} ACGI preference records")
-        
-        # Commit changes
-        conn.commit()
+            # A random token, so the version never repeats one a process has cached
+            version_key, version = f'{mapping_table}_version', uuid.uuid4().hex
+            cursor.execute(BUMP_MAPPING_VERSION_SQL, (version, version_key))
+            if not cursor.rowcount:
+                cursor.execute(INSERT_MAPPING_VERSION_SQL, (version_key, version))
+            print(f"   ✅ Deleted {mapping_deleted} {mapping_model} records")
+            
+            # 4. Delete SearchPreference records for the object type
+            print(f"4. Deleting SearchPreference records for '{object_type}'...")
+            cursor.execute(DELETE_SEARCH_PREFERENCES_SQL, (object_type,))
+            search_pref_deleted = cursor.rowcount
+            print(f"   ✅ Deleted {search_pref_deleted} SearchPreference records")
         
         # Summary
-        total_deleted = form_fields_deleted + acgi_config_deleted + acgi_fields_deleted + mapping_deleted + search_pref_deleted
-        if object_type == 'contacts':
-            total_deleted += pref_deleted
+        total_deleted = form_fields_deleted + app_state_deleted + mapping_deleted + search_pref_deleted
         
         print("=" * 50)
         print(f"✅ Successfully reset data for '{object_type}'")
@@ -121,46 +135,60 @@ def reset_object_data(object_type):
     except Exception as e:
         print(f"❌ Unexpected error: {e}")
         return False
-    finally:
-        if conn:
-            conn.close()
 
-def main():
-    """Main function to handle command line arguments"""
-    
-    if len(sys.argv) != 2:
-        print("Usage: python reset_object_data.py <object_type>")
-        print("\nValid object types:")
-        print("  - contacts")
-        print("  - memberships") 
-        print("  - purchased_products")
-        print("  - events")
-        print("\nExample: python reset_object_data.py purchased_products")
-        return
-    
-    object_type = sys.argv[1].lower()
+def confirm_and_reset(object_type, assume_yes=False):
+    """
+    Confirm with the user (unless assume_yes) and reset the object type.
     
+    Returns:
+        bool: Whether the reset succeeded, or None if it was cancelled
+    """
     # Confirm before proceeding
-    print(f"⚠️  WARNING: This will permanently delete all data for '{object_type}'")
-    print("This includes:")
-    print("  - Field mappings")
-    print("  - Field configurations") 
-    print("  - ACGI field data")
-    print("  - Search preferences")
-    print("  - All related configuration data")
-    print()
+    if not assume_yes:
+        print(f"⚠️  WARNING: This will permanently delete all data for '{object_type}'")
+        print("This includes:")
+        print("  - Field mappings")
+        print("  - Field configurations")
+        print("  - ACGI field data")
+        print("  - Search preferences")
+        print("  - All related configuration data")
+        print()
+        
+        confirm = input("Are you sure you want to continue? (yes/no): ").lower().strip()
+        if confirm not in ['yes', 'y']:
+            print("❌ Reset cancelled.")
+            return None
     
-    confirm = input("Are you sure you want to continue? (yes/no): ").lower().strip()
+    success = reset_object_data(object_type)
+    if success:
+        print("\n🎉 Reset completed successfully!")
+    else:
+        print("\n💥 Reset failed!")
+    return success
+
+def main():
+    """Main function to handle command line arguments"""
+    parser = argparse.ArgumentParser(
+        description='Reset all integration data for one object type',
+        epilog='Example: python reset_object_data.py purchased_products'
+    )
+    parser.add_argument('object_type', type=str.lower, choices=list(MAPPING_TABLES),
+                        help='Object type to reset')
+    parser.add_argument('-y', '--yes', action='store_true',
+                        help='Skip the confirmation prompt (for non-interactive runs)')
+    parser.add_argument('--json-output', action='store_true',
+                        help='Print a JSON result on stdout; progress messages go to stderr')
+    args = parser.parse_args()
     
-    if confirm in ['yes', 'y']:
-        success = reset_object_data(object_type)
-        if success:
-            print("\n🎉 Reset completed successfully!")
-        else:
-            print("\n💥 Reset failed!")
-            sys.exit(1)
+    if args.json_output:
+        with contextlib.redirect_stdout(sys.stderr):
+            success = confirm_and_reset(args.object_type, args.yes)
+        print(json.dumps({'object_type': args.object_type, 'success': success}))
     else:
-        print("❌ Reset cancelled.")
+        success = confirm_and_reset(args.object_type, args.yes)
+    
+    if success is False:
+        sys.exit(1)
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
@@ -4,12 +4,13 @@ Script to reset all database data associated with the orders tab.
 This will clear FormField configurations, ACGI field configurations, and field mappings for orders.
 """
 
+import argparse
 import sqlite3
 import os
 import sys
 
-def reset_orders_data():
-    """Reset all orders-related data from the database"""
+def reset_orders_data(compact=False):
+    """Reset all orders-related data from the database; compact=True also VACUUMs the file"""
     
     # Get the database path
     db_path = 'local_app.db'
@@ -18,72 +19,78 @@ def reset_orders_data():
         print(f"Database file {db_path} not found!")
         return False
     
+    conn = None
     try:
         # Connect to the database
         conn = sqlite3.connect(db_path)
         cursor = conn.cursor()
         
-        print("Starting orders data reset...")
-        
-        # 1. Delete FormField records for orders
-        print("1. Deleting FormField records for orders...")
-        cursor.execute("DELETE FROM form_fields WHERE object_type = 'orders'")
-        deleted_form_fields = cursor.rowcount
-        print(f"   ✓ Deleted {deleted_form_fields} FormField records")
-        
-        # 2. Delete AppState records for orders ACGI field config
-        print("2. Deleting ACGI field configuration for orders...")
-        cursor.execute("DELETE FROM app_state WHERE key = 'acgi_field_config_orders'")
-        deleted_acgi_config = cursor.rowcount
-        print(f"   ✓ Deleted {deleted_acgi_config} ACGI field config records")
-        
-        # 3. Delete OrderFieldMapping records
-        print("3. Deleting OrderFieldMapping records...")
-        cursor.execute("DELETE FROM order_field_mapping")
-        deleted_mappings = cursor.rowcount
-        print(f"   ✓ Deleted {deleted_mappings} OrderFieldMapping records")
-        
-        # 4. Delete SearchPreference records for orders
-        print("4. Deleting SearchPreference records for orders...")
-        cursor.execute("DELETE FROM search_preferences WHERE object_type = 'orders'")
-        deleted_search_prefs = cursor.rowcount
-        print(f"   ✓ Deleted {deleted_search_prefs} SearchPreference records")
+        # WAL + synchronous=NORMAL: no fsync of the main database file on commit
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
         
-        # Commit the changes
-        conn.commit()
-        
-        # Verify the changes
-        print("\n5. Verifying changes...")
-        
-        # Check remaining records
-        cursor.execute("SELECT COUNT(*) FROM form_fields WHERE object_type = 'orders'")
-        remaining_form_fields = cursor.fetchone()[0]
-        
-        cursor.execute("SELECT COUNT(*) FROM app_state WHERE key = 'acgi_field_config_orders'")
-        remaining_acgi_config = cursor.fetchone()[0]
+        print("Starting orders data reset...")
         
-        cursor.execute("SELECT COUNT(*) FROM order_field_mapping")
-        remaining_mappings = cursor.fetchone()[0]
+        # All deletes run in one transaction: committed together, or rolled back on error
+        with conn:
+            # Take the write lock up front rather than on the first DELETE
+            cursor.execute("BEGIN IMMEDIATE")
+            
+            # 1. Delete FormField records for orders
+            print("1. Deleting FormField records for orders...")
+            cursor.execute("DELETE FROM form_fields WHERE object_type = 'orders'")
+            deleted_form_fields = cursor.rowcount
+            print(f"   ✓ Deleted {deleted_form_fields} FormField records")
+            
+            # 2. Delete AppState records for orders ACGI field config
+            print("2. Deleting ACGI field configuration for orders...")
+            cursor.execute("DELETE FROM app_state WHERE key = 'acgi_field_config_orders'")
+            deleted_acgi_config = cursor.rowcount
+            print(f"   ✓ Deleted {deleted_acgi_config} ACGI field config records")
+            
+            # 3. Delete OrderFieldMapping records (no WHERE clause, so SQLite
+            # clears the whole table instead of deleting row by row)
+            print("3. Deleting OrderFieldMapping records...")
+            cursor.execute("DELETE FROM order_field_mapping")
+            deleted_mappings = cursor.rowcount
+            print(f"   ✓ Deleted {deleted_mappings} OrderFieldMapping records")
+            
+            # 4. Delete SearchPreference records for orders
+            print("4. Deleting SearchPreference records for orders...")
+            cursor.execute("DELETE FROM search_preferences WHERE object_type = 'orders'")
+            deleted_search_prefs = cursor.rowcount
+            print(f"   ✓ Deleted {deleted_search_prefs} SearchPreference records")
         
-        cursor.execute("SELECT COUNT(*) FROM search_preferences WHERE object_type = 'orders'")
-        remaining_search_prefs = cursor.fetchone()[0]
+        # rowcount of each DELETE in the committed transaction is authoritative,
+        # so no re-count of the tables afterwards
+        total_deleted = deleted_form_fields + deleted_acgi_config + deleted_mappings + deleted_search_prefs
+        print(f"\n📊 Total records deleted: {total_deleted}")
         
-        print(f"   Remaining FormField records for orders: {remaining_form_fields}")
-        print(f"   Remaining ACGI field config records for orders: {remaining_acgi_config}")
-        print(f"   Remaining OrderFieldMapping records: {remaining_mappings}")
-        print(f"   Remaining SearchPreference records for orders: {remaining_search_prefs}")
+        # Refresh planner statistics for the tables whose contents changed enough
+        cursor.execute("PRAGMA optimize")
+        if compact:
+            # Rewrite the file to drop the freed pages (must run outside a transaction)
+            print("Compacting database file...")
+            cursor.execute("VACUUM")
         
-        conn.close()
         print("\n✅ Orders data reset completed successfully!")
         return True
         
     except Exception as e:
         print(f"❌ Error during orders data reset: {str(e)}")
         return False
+    finally:
+        if conn:
+            conn.close()
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Reset all database data associated with the orders tab')
+    parser.add_argument('--compact', action='store_true',
+                        help='VACUUM the database afterwards to shrink the file')
+    args = parser.parse_args()
+    
     print("Starting orders data reset...")
-    success = reset_orders_data()
+    success = reset_orders_data(compact=args.compact)
     
     if success:
         print("\n🎉 Orders data reset successful!")
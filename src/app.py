@@ -2,14 +2,15 @@ import os
 import logging
 from flask import Flask
 from config import Config
-from models import init_db
-from routes.auth import auth_bp
-from routes.main import main_bp, init_routes
-from routes.api import init_api_routes
-from routes.pages import init_page_routes
+from models import init_db, Session
 
 def create_app():
     """Create and configure the Flask application"""
+    # Route modules pull in the service clients; import them only when an app is built
+    from routes.auth import auth_bp
+    from routes.main import main_bp, init_routes
+    from routes.api import init_api_routes
+    
     app = Flask(__name__)
     
     # Configure app
@@ -27,14 +28,23 @@ def create_app():
     # Initialize database
     init_db()
     
-    # Initialize scheduler service
-    try:
-        from services.scheduler_service import scheduler_service
-        scheduler_service.start()
-        logging.info("Scheduler service started successfully")
-    except Exception as e:
-        logging.error(f"Error starting scheduler service: {str(e)}")
-        # Don't fail the app startup, just log the error
+    @app.teardown_appcontext
+    def remove_db_session(exception=None):
+        # Discard this thread's scoped session at the end of each request
+        Session.remove()
+    
+    # Initialize scheduler service (ENABLE_SCHEDULER=false keeps it, and APScheduler,
+    # out of processes that should only serve requests)
+    if Config.ENABLE_SCHEDULER:
+        try:
+            from services.scheduler_service import scheduler_service
+            scheduler_service.start()
+            logging.info("Scheduler service started successfully")
+        except Exception as e:
+            logging.error(f"Error starting scheduler service: {str(e)}")
+            # Don't fail the app startup, just log the error
+    else:
+        logging.info("Scheduler service disabled (ENABLE_SCHEDULER=false)")
     
     # Register blueprints
     app.register_blueprint(auth_bp)
@@ -46,11 +56,18 @@ def create_app():
     
     return app
 
-# Create the app instance for WSGI servers
-app = create_app()
+def __getattr__(name):
+    """Create the app instance for WSGI servers on first access of `app`, so importing
+    create_app (wsgi.py, start.py, run_dev.py) does not build and initialize a second app"""
+    if name == 'app':
+        global app
+        app = create_app()
+        return app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 if __name__ == '__main__':
     # This is for direct execution (development)
+    app = create_app()
     app.run(
         host=Config.HOST,
         port=Config.PORT,
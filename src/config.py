@@ -15,6 +15,13 @@ class Config:
     ADMIN_USERNAME = os.environ.get('ADMIN_USERNAME') or 'admin'
     ADMIN_PASSWORD = os.environ.get('ADMIN_PASSWORD') or 'admin123'
     SESSION_COOKIE_SECURE = os.environ.get('SESSION_COOKIE_SECURE', 'false').lower() == 'true'
+    # Hash method for seeding the admin user. Memory-hard scrypt (faster to compute than
+    # 600k-iteration PBKDF2) unless FLASK_ENV says development/testing, where a cheaper
+    # hash keeps DB bootstrap fast. check_password_hash verifies either format.
+    ENV = os.environ.get('FLASK_ENV', 'production').lower()
+    ADMIN_PW_METHOD = os.environ.get('ADMIN_PW_METHOD') or (
+        'pbkdf2:sha256:10000' if ENV in ('development', 'testing') else 'scrypt'
+    )
     SESSION_COOKIE_HTTPONLY = True
     PERMANENT_SESSION_LIFETIME = timedelta(hours=8)
     
@@ -34,14 +41,22 @@ class Config:
     # In-Memory SQLite (default)
     IN_MEMORY_DATABASE_URL = 'sqlite:///:memory:'
     
+    # PostgreSQL connection pool (per worker process)
+    DB_POOL_SIZE = int(os.environ.get('DB_POOL_SIZE', 10))
+    DB_MAX_OVERFLOW = int(os.environ.get('DB_MAX_OVERFLOW', 5))
+    
     # Logging Configuration
     LOG_LEVEL = os.environ.get('LOG_LEVEL', 'INFO')
     LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    # Log every SQL statement the engine emits (diagnostics only)
+    SQL_ECHO = os.environ.get('SQL_ECHO', 'false').lower() == 'true'
     
     # Application Configuration
     DEBUG = os.environ.get('DEBUG', 'false').lower() == 'true'
     HOST = os.environ.get('HOST', '0.0.0.0')
     PORT = int(os.environ.get('PORT', 5000))
+    # Run the background sync scheduler in this process
+    ENABLE_SCHEDULER = os.environ.get('ENABLE_SCHEDULER', 'true').lower() == 'true'
     
     # HubSpot Configuration
     HUBSPOT_API_KEY = os.environ.get('HUBSPOT_API_KEY', '')
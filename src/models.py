@@ -1,39 +1,109 @@
+from contextlib import contextmanager
 from datetime import datetime, timezone
-from sqlalchemy import create_engine, Column, String, Text, DateTime, Integer, inspect
+from sqlalchemy import create_engine, event, func, Column, Index, String, Text, DateTime, Integer, inspect, text
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import scoped_session, sessionmaker
+from sqlalchemy.pool import StaticPool
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from config import Config
 import logging
-import json
+import re
+import time
+import uuid
+import orjson
 
 logger = logging.getLogger(__name__)
 
 # Database setup - support multiple database types
+# Heroku provides postgres:// and a bare postgresql:// selects psycopg2; both are
+# rewritten to the psycopg 3 driver
+_POSTGRES_URL_RE = re.compile(r'^postgres(?:ql)?://')
+
 def get_database_url():
     """Get database URL based on environment configuration"""
     if Config.USE_POSTGRES:
-        # Handle Heroku PostgreSQL URL conversion
-        # Heroku provides postgres:// but SQLAlchemy expects postgresql://
         database_url = Config.DATABASE_URL
-        if database_url and database_url.startswith('postgres://'):
-            database_url = database_url.replace('postgres://', 'postgresql://', 1)
-            logger.info("Converted Heroku postgres:// URL to postgresql:// for SQLAlchemy compatibility")
+        if database_url:
+            database_url, converted = _POSTGRES_URL_RE.subn('postgresql+psycopg://', database_url, count=1)
+            if converted:
+                logger.info("Using the psycopg driver for the PostgreSQL DATABASE_URL")
         return database_url
+    return Config.LOCAL_DATABASE_URL if Config.USE_LOCAL_DB else Config.IN_MEMORY_DATABASE_URL
+    
+def get_engine_options():
+    """Connection pool settings for the configured database type"""
+    if Config.USE_POSTGRES:
+        # Pooled connections per worker process; pool_size + max_overflow times the
+        # number of gunicorn workers must fit the server's connection limit
+        return {
+            'pool_size': Config.DB_POOL_SIZE,
+            'max_overflow': Config.DB_MAX_OVERFLOW,
+            'pool_pre_ping': True,  # Verify connections before use
+            'pool_recycle': 1800,   # Recycle connections every 30 minutes
+        }
     elif Config.USE_LOCAL_DB:
-        return Config.LOCAL_DATABASE_URL
+        # Pooled connections keep their page cache between requests; wait up to 30s
+        # for another writer instead of failing with "database is locked"
+        return {
+            'pool_pre_ping': True,
+            'connect_args': {'check_same_thread': False, 'timeout': 30},
+        }
     else:
-        return Config.IN_MEMORY_DATABASE_URL
-    
+        # One shared connection, so every thread sees the same in-memory database
+        return {
+            'poolclass': StaticPool,
+            'connect_args': {'check_same_thread': False},
+        }
+
 # Create engine with connection pooling and error handling
 engine = create_engine(
     get_database_url(), 
-    echo=True,
-    pool_pre_ping=True,  # Verify connections before use
-    pool_recycle=300,    # Recycle connections every 5 minutes
-    connect_args={'check_same_thread': False} if 'sqlite' in get_database_url() else {}
+    # SQL statement logging only on request, independent of Flask DEBUG/LOG_LEVEL
+    echo=Config.SQL_ECHO,
+    **get_engine_options()
 )
+
+if engine.dialect.name == 'sqlite' and Config.USE_LOCAL_DB:
+    @event.listens_for(engine, 'connect')
+    def _set_sqlite_pragmas(dbapi_connection, connection_record):
+        # WAL + synchronous=NORMAL: commits append to the WAL instead of fsyncing the main file
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        # Temp tables/sorts in memory, 64 MB page cache, reads through a 256 MB mmap
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.execute("PRAGMA cache_size=-64000")
+        cursor.execute("PRAGMA mmap_size=268435456")
+        cursor.close()
+
 Base = declarative_base()
-Session = sessionmaker(bind=engine)
+# One Session per thread, reused by every Session() call in that thread (open -> work ->
+# close() leaves it ready for the next use); the Flask app removes it after each request.
+# Objects keep their loaded values after commit instead of being expired and reloaded.
+Session = scoped_session(sessionmaker(bind=engine, expire_on_commit=False))
+
+@contextmanager
+def session_scope(session=None):
+    """
+    Run a unit of work on the thread's session: commit on success, roll back on error,
+    then close it (the Session object stays registered for reuse by the thread).
+    With a caller's session, only flush - the caller commits or rolls back.
+    """
+    if session is not None:
+        yield session
+        session.flush()
+        return
+    
+    session = Session()
+    try:
+        yield session
+        session.commit()
+    except Exception:
+        session.rollback()
+        raise
+    finally:
+        session.close()
 
 class User(Base):
     __tablename__ = 'users'
@@ -41,20 +111,30 @@ class User(Base):
     id = Column(Integer, primary_key=True)
     username = Column(String(50), unique=True, nullable=False)
     password_hash = Column(String(255), nullable=False)
-    created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
+    # Stamped by the database in the INSERT itself rather than by Python
+    created_at = Column(DateTime, default=func.now(), server_default=func.now())
     last_login = Column(DateTime)
 
 class AppState(Base):
     __tablename__ = 'app_state'
+    # Rows are only ever looked up by key: make it the primary key and, on SQLite,
+    # store the table clustered on it (no separate rowid B-tree plus key index).
+    # Databases created before this keep their id column; the mapping works on both.
+    __table_args__ = {'sqlite_with_rowid': False}
     
-    id = Column(Integer, primary_key=True)
-    key = Column(String(100), unique=True, nullable=False)
+    key = Column(String(100), primary_key=True)
     value = Column(Text)
-    created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
-    updated_at = Column(DateTime, default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc))
+    created_at = Column(DateTime, default=func.now(), server_default=func.now())
+    updated_at = Column(DateTime, default=func.now(), server_default=func.now(), onupdate=func.now())
 
 class FormField(Base):
     __tablename__ = 'form_fields'
+    __table_args__ = (
+        # Fields of an object type in display order
+        Index('ix_form_fields_object_type_order', 'object_type', 'order_index'),
+        # One row per field of an object type
+        Index('ix_form_fields_object_field', 'object_type', 'field_name', unique=True),
+    )
     
     id = Column(Integer, primary_key=True)
     object_type = Column(String(50), nullable=False)  # contact, deal, etc.
@@ -64,16 +144,99 @@ class FormField(Base):
     is_enabled = Column(String(10), default='false')  # true/false as string
     is_important = Column(String(10), default='false')  # true/false as string
     order_index = Column(Integer, default=0)
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime, default=func.now(), server_default=func.now())
 
 class SearchPreference(Base):
     __tablename__ = 'search_preferences'
+    __table_args__ = (
+        # One preference per object type (an index rather than a column UNIQUE, so
+        # manage_db can add it to existing tables)
+        Index('ix_search_preferences_object_type', 'object_type', unique=True),
+    )
     
     id = Column(Integer, primary_key=True)
     object_type = Column(String(50), nullable=False)  # contacts, deals, etc.
     search_strategy = Column(String(50), nullable=False)  # email_only, customer_id_only, email_then_customer_id, customer_id_then_email
-    created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
-    updated_at = Column(DateTime, default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc))
+    created_at = Column(DateTime, default=func.now(), server_default=func.now())
+    updated_at = Column(DateTime, default=func.now(), server_default=func.now(), onupdate=func.now())
+
+# Each mapping table's version ('<table>_version'), replaced in AppState on every save so
+# each process can tell whether its cached copy of the mapping is still current. Versions
+# are random tokens, not counters: a counter restarts at '1' when the row is deleted and
+# would then match a stale cached copy.
+_mapping_cache = {}  # version key -> (version, mapping) as last read by this process
+
+def _bump_mapping_version(session, key):
+    """Store a new mapping version in AppState within the session's transaction; returns the new version"""
+    version = uuid.uuid4().hex
+    updated = session.query(AppState).filter_by(key=key).update(
+        {AppState.value: version}, synchronize_session=False
+    )
+    if not updated:
+        session.add(AppState(key=key, value=version))
+        session.flush()
+    return version
+
+# Single-row tables (the mapping tables, scheduling_config) keep their data in this row
+SINGLE_ROW_ID = 1
+
+def _upsert_single_row(session, model, values):
+    """Write the row of a single-row table in one INSERT ... ON CONFLICT statement"""
+    dialect = session.get_bind().dialect.name
+    if dialect == 'sqlite':
+        stmt = sqlite_insert(model.__table__)
+    elif dialect == 'postgresql':
+        stmt = postgresql_insert(model.__table__)
+    else:
+        session.merge(model(id=SINGLE_ROW_ID, **values))
+        return
+    
+    update_values = dict(values)
+    if 'updated_at' in model.__table__.c:
+        # ON CONFLICT DO UPDATE does not apply Column.onupdate
+        update_values['updated_at'] = func.now()
+    stmt = stmt.values(id=SINGLE_ROW_ID, **values).on_conflict_do_update(
+        index_elements=['id'], set_=update_values
+    )
+    session.execute(stmt)
+
+def _save_mapping(model, mapping, session=None):
+    """Save a mapping table's mapping. With a caller's session, only flush - the caller commits."""
+    version_key = f'{model.__tablename__}_version'
+    try:
+        with session_scope(session) as s:
+            # Convert mapping to JSON string
+            payload = orjson.dumps(mapping, option=orjson.OPT_NON_STR_KEYS).decode() if mapping else '{}'
+            _upsert_single_row(s, model, {'mapping': payload})
+            version = _bump_mapping_version(s, version_key)
+    except Exception as e:
+        logger.error(f"Error saving mapping: {str(e)}")
+        raise
+    # A caller's session has not committed yet; the version bump makes readers reload then
+    if session is None:
+        _mapping_cache[version_key] = (version, orjson.loads(payload))
+
+def _cached_mapping(session, model, version):
+    """This process's parsed mapping of a table at the given AppState version, reloaded if stale"""
+    version_key = f'{model.__tablename__}_version'
+    cached = _mapping_cache.get(version_key)
+    if cached is None or cached[0] != version:
+        # The upserted row has the lowest id; older databases may hold a single row with another id
+        obj = session.query(model).order_by(model.id).first()
+        # Parse JSON string back to dict
+        cached = (version, orjson.loads(obj.mapping) if obj and obj.mapping else {})
+        _mapping_cache[version_key] = cached
+    return dict(cached[1])
+
+def _load_mapping(model):
+    """Load a mapping table's mapping, reusing this process's cached copy while its AppState version is current"""
+    try:
+        with session_scope() as s:
+            version = s.query(AppState.value).filter_by(key=f'{model.__tablename__}_version').scalar()
+            return _cached_mapping(s, model, version)
+    except Exception as e:
+        logger.error(f"Error loading mapping: {str(e)}")
+        return {}
 
 class ContactFieldMapping(Base):
     __tablename__ = 'contact_field_mapping'
@@ -81,113 +244,42 @@ class ContactFieldMapping(Base):
     mapping = Column(Text)  # Store JSON as text instead of PickleType
 
     @staticmethod
-    def set_mapping(mapping):
-        session = Session()
-        try:
-            obj = session.query(ContactFieldMapping).first()
-            if not obj:
-                obj = ContactFieldMapping()
-            # Convert mapping to JSON string
-            obj.mapping = json.dumps(mapping) if mapping else '{}'
-            session.add(obj)
-            session.commit()
-        except Exception as e:
-            session.rollback()
-            logger.error(f"Error saving mapping: {str(e)}")
-            raise
-        finally:
-            session.close()
+    def set_mapping(mapping, session=None):
+        """Save the mapping. With a caller's session, only flush - the caller commits."""
+        _save_mapping(ContactFieldMapping, mapping, session)
 
     @staticmethod
     def get_mapping():
-        session = Session()
-        try:
-            obj = session.query(ContactFieldMapping).first()
-            if obj and obj.mapping:
-                # Parse JSON string back to dict
-                return json.loads(obj.mapping)
-            return {}
-        except Exception as e:
-            logger.error(f"Error loading mapping: {str(e)}")
-            return {}
-        finally:
-            session.close()
+        return _load_mapping(ContactFieldMapping)
 
 
 class MembershipFieldMapping(Base):
     __tablename__ = 'membership_field_mapping'
     id = Column(Integer, primary_key=True)
     mapping = Column(Text)  # Store JSON as text instead of PickleType
-    
+
     @staticmethod
-    def set_mapping(mapping):
-        session = Session()
-        try:
-            obj = session.query(MembershipFieldMapping).first()
-            if not obj:
-                obj = MembershipFieldMapping()
-            obj.mapping = json.dumps(mapping) if mapping else '{}'
-            session.add(obj)
-            session.commit()
-        except Exception as e:
-            session.rollback()
-            logger.error(f"Error saving mapping: {str(e)}")
-            raise
-        finally:
-            session.close()
+    def set_mapping(mapping, session=None):
+        """Save the mapping. With a caller's session, only flush - the caller commits."""
+        _save_mapping(MembershipFieldMapping, mapping, session)
 
     @staticmethod
     def get_mapping():
-        session = Session()
-        try:
-            obj = session.query(MembershipFieldMapping).first()
-            if obj and obj.mapping:
-                # Parse JSON string back to dict
-                return json.loads(obj.mapping)
-            return {}
-        except Exception as e:
-            logger.error(f"Error loading mapping: {str(e)}")
-            return {}
-        finally:
-            session.close()
+        return _load_mapping(MembershipFieldMapping)
 
 class EventFieldMapping(Base):
     __tablename__ = 'event_field_mapping'
     id = Column(Integer, primary_key=True)
     mapping = Column(Text)  # Store JSON as text instead of PickleType
-    
+
     @staticmethod
-    def set_mapping(mapping):
-        session = Session()
-        try:
-            obj = session.query(EventFieldMapping).first()
-            if not obj:
-                obj = EventFieldMapping()
-            obj.mapping = json.dumps(mapping) if mapping else '{}'
-            session.add(obj)
-            session.commit()
-        except Exception as e:
-            session.rollback()
-            logger.error(f"Error saving mapping: {str(e)}")
-            raise
-        finally:
-            session.close()
+    def set_mapping(mapping, session=None):
+        """Save the mapping. With a caller's session, only flush - the caller commits."""
+        _save_mapping(EventFieldMapping, mapping, session)
 
     @staticmethod
     def get_mapping():
-        session = Session()
-        try:
-            obj = session.query(EventFieldMapping).first()
-            if obj and obj.mapping:
-                # Parse JSON string back to dict
-                return json.loads(obj.mapping)
-            return {}
-        except Exception as e:
-            logger.error(f"Error loading mapping: {str(e)}")
-            return {}
-        finally:
-            session.close()
-
+        return _load_mapping(EventFieldMapping)
 
 
 class PurchasedProductsFieldMapping(Base):
@@ -196,36 +288,35 @@ class PurchasedProductsFieldMapping(Base):
     mapping = Column(Text)  # Store JSON as text instead of PickleType
 
     @staticmethod
-    def set_mapping(mapping):
-        session = Session()
-        try:
-            obj = session.query(PurchasedProductsFieldMapping).first()
-            if not obj:
-                obj = PurchasedProductsFieldMapping()
-            obj.mapping = json.dumps(mapping) if mapping else '{}'
-            session.add(obj)
-            session.commit()
-        except Exception as e:
-            session.rollback()
-            logger.error(f"Error saving mapping: {str(e)}")
-            raise   
-        finally:
-            session.close()
+    def set_mapping(mapping, session=None):
+        """Save the mapping. With a caller's session, only flush - the caller commits."""
+        _save_mapping(PurchasedProductsFieldMapping, mapping, session)
 
     @staticmethod
     def get_mapping():
-        session = Session()
-        try:
-            obj = session.query(PurchasedProductsFieldMapping).first()
-            if obj and obj.mapping:
-                # Parse JSON string back to dict
-                return json.loads(obj.mapping)
-            return {}
-        except Exception as e:  
-            logger.error(f"Error loading mapping: {str(e)}")
-            return {}
-        finally:
-            session.close()
+        return _load_mapping(PurchasedProductsFieldMapping)
+
+# Mapping table model for each object type
+MAPPING_MODELS = {
+    'contacts': ContactFieldMapping,
+    'memberships': MembershipFieldMapping,
+    'purchased_products': PurchasedProductsFieldMapping,
+    'events': EventFieldMapping,
+}
+
+def get_all_mappings():
+    """Load the mapping of every object type, checking all their versions in one query"""
+    try:
+        with session_scope() as s:
+            version_keys = [f'{model.__tablename__}_version' for model in MAPPING_MODELS.values()]
+            versions = dict(s.query(AppState.key, AppState.value).filter(AppState.key.in_(version_keys)))
+            return {
+                object_type: _cached_mapping(s, model, versions.get(f'{model.__tablename__}_version'))
+                for object_type, model in MAPPING_MODELS.items()
+            }
+    except Exception as e:
+        logger.error(f"Error loading mappings: {str(e)}")
+        return {object_type: {} for object_type in MAPPING_MODELS}
 
 class SchedulingConfig(Base):
     __tablename__ = 'scheduling_config'
@@ -240,73 +331,60 @@ class SchedulingConfig(Base):
     sync_orders = Column(String(10), default='true')  # true/false as string
     sync_events = Column(String(10), default='true')  # true/false as string
     last_sync = Column(DateTime)  # Last successful sync timestamp
-    created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
-    updated_at = Column(DateTime, default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc))
+    created_at = Column(DateTime, default=func.now(), server_default=func.now())
+    updated_at = Column(DateTime, default=func.now(), server_default=func.now(), onupdate=func.now())
 
     @staticmethod
     def get_config():
-        session = Session()
         try:
-            config = session.query(SchedulingConfig).first()
-            if config:
-                return {
-                    'frequency': config.frequency,
-                    'enabled': config.enabled == 'true',
-                    'customer_ids': config.customer_ids,
-                    'production_mode': config.production_mode == 'true',
-                    'sync_contacts': config.sync_contacts == 'true',
-                    'sync_memberships': config.sync_memberships == 'true',
-                    'sync_purchased_products': config.sync_orders == 'true',
-                    'sync_events': config.sync_events == 'true',
-                    'last_sync': config.last_sync.isoformat() if config.last_sync else None
-                }
-            return None
+            with session_scope() as session:
+                # Lowest id first: the upserted row (older databases may hold one with another id)
+                config = session.query(SchedulingConfig).order_by(SchedulingConfig.id).first()
+                if config:
+                    return {
+                        'frequency': config.frequency,
+                        'enabled': config.enabled == 'true',
+                        'customer_ids': config.customer_ids,
+                        'production_mode': config.production_mode == 'true',
+                        'sync_contacts': config.sync_contacts == 'true',
+                        'sync_memberships': config.sync_memberships == 'true',
+                        'sync_purchased_products': config.sync_orders == 'true',
+                        'sync_events': config.sync_events == 'true',
+                        'last_sync': config.last_sync.isoformat() if config.last_sync else None
+                    }
+                return None
         except Exception as e:
             logger.error(f"Error getting scheduling config: {str(e)}")
             return None
-        finally:
-            session.close()
 
     @staticmethod
     def save_config(config_data):
-        session = Session()
         try:
-            config = session.query(SchedulingConfig).first()
-            if not config:
-                config = SchedulingConfig()
-            
-            config.frequency = config_data.get('frequency')
-            config.enabled = str(config_data.get('enabled', False)).lower()
-            config.customer_ids = config_data.get('customer_ids', '')
-            config.production_mode = str(config_data.get('production_mode', False)).lower()
-            config.sync_contacts = str(config_data.get('sync_contacts', True)).lower()
-            config.sync_memberships = str(config_data.get('sync_memberships', True)).lower()
-            config.sync_orders = str(config_data.get('sync_purchased_products', True)).lower()
-            config.sync_events = str(config_data.get('sync_events', True)).lower()
-            
-            session.add(config)
-            session.commit()
+            with session_scope() as session:
+                _upsert_single_row(session, SchedulingConfig, {
+                    'frequency': config_data.get('frequency'),
+                    'enabled': str(config_data.get('enabled', False)).lower(),
+                    'customer_ids': config_data.get('customer_ids', ''),
+                    'production_mode': str(config_data.get('production_mode', False)).lower(),
+                    'sync_contacts': str(config_data.get('sync_contacts', True)).lower(),
+                    'sync_memberships': str(config_data.get('sync_memberships', True)).lower(),
+                    'sync_orders': str(config_data.get('sync_purchased_products', True)).lower(),
+                    'sync_events': str(config_data.get('sync_events', True)).lower(),
+                })
             return True
         except Exception as e:
-            session.rollback()
             logger.error(f"Error saving scheduling config: {str(e)}")
             return False
-        finally:
-            session.close()
 
     @staticmethod
     def update_last_sync():
-        session = Session()
         try:
-            config = session.query(SchedulingConfig).first()
-            if config:
-                config.last_sync = datetime.now(timezone.utc)
-                session.commit()
+            with session_scope() as session:
+                config = session.query(SchedulingConfig).order_by(SchedulingConfig.id).first()
+                if config:
+                    config.last_sync = datetime.now(timezone.utc)
         except Exception as e:
-            session.rollback()
             logger.error(f"Error updating last sync: {str(e)}")
-        finally:
-            session.close()
 
 def init_db():
     """Initialize database tables"""
@@ -321,16 +399,17 @@ def init_db():
         
         logger.info("Checking database tables...")
         
-        # Check if tables already exist
-        inspector = inspect(engine)
-        existing_tables = inspector.get_table_names()
+        # One reflection query for the existing tables, then create only the missing
+        # ones (create_all's checkfirst would probe every table separately)
+        existing_tables = set(inspect(engine).get_table_names())
+        missing_tables = [table for table in Base.metadata.sorted_tables if table.name not in existing_tables]
         
-        if existing_tables:
-            logger.info(f"Tables already exist: {existing_tables}")
+        if not missing_tables:
+            logger.info(f"Tables already exist: {sorted(existing_tables)}")
             logger.info("Skipping table creation - tables already present")
         else:
-            logger.info("Creating database tables...")
-            Base.metadata.create_all(engine)
+            logger.info(f"Creating database tables: {[table.name for table in missing_tables]}")
+            Base.metadata.create_all(engine, tables=missing_tables, checkfirst=False)
             logger.info("Database tables created successfully")
         
         # Always create default admin user if it doesn't exist
@@ -344,10 +423,13 @@ def init_db():
 
 def reset_db():
     """Reset database - drop all tables and recreate them"""
+    global _bootstrap_checked
     try:
         logger.warning("Dropping all database tables...")
         Base.metadata.drop_all(engine)
         logger.info("All tables dropped successfully")
+        # The bootstrap marker went with the tables
+        _bootstrap_checked = False
         
         logger.info("Creating database tables...")
         Base.metadata.create_all(engine)
@@ -363,11 +445,19 @@ def reset_db():
         logger.error(f"Error resetting database: {str(e)}")
         return False
 
+# Set in AppState (to the admin username) once the default admin has been ensured, so
+# later process starts skip the users query; _bootstrap_checked skips it within a process
+BOOTSTRAP_DONE_KEY = 'bootstrap_done'
+_bootstrap_checked = False
+
 def create_default_admin():
     """Create default admin user if it doesn't exist"""
+    global _bootstrap_checked
+    if _bootstrap_checked:
+        return
+    
     session = None
     try:
-        from werkzeug.security import generate_password_hash
         from config import Config
         
         # Test database connection first
@@ -377,20 +467,29 @@ def create_default_admin():
         
         session = get_session()
         try:
-            # Check if admin user exists
-            admin_user = session.query(User).filter_by(username=Config.ADMIN_USERNAME).first()
-            if not admin_user:
+            bootstrapped_for = session.query(AppState.value).filter_by(key=BOOTSTRAP_DONE_KEY).scalar()
+            if bootstrapped_for == Config.ADMIN_USERNAME:
+                _bootstrap_checked = True
+                return
+            
+            # Check if admin user exists (before paying for the password hash)
+            admin_exists = session.query(User.id).filter_by(username=Config.ADMIN_USERNAME).scalar()
+            if not admin_exists:
+                from werkzeug.security import generate_password_hash
+                
                 # Create default admin user
-                password_hash = generate_password_hash(Config.ADMIN_PASSWORD)
-                admin_user = User(
-                    username=Config.ADMIN_USERNAME,
-                    password_hash=password_hash
-                )
-                session.add(admin_user)
-                session.commit()
-                logger.info(f"Created default admin user: {Config.ADMIN_USERNAME}")
+                password_hash = generate_password_hash(Config.ADMIN_PASSWORD, method=Config.ADMIN_PW_METHOD)
+                created = insert_user(session, Config.ADMIN_USERNAME, password_hash)
+                if created:
+                    logger.info(f"Created default admin user: {Config.ADMIN_USERNAME}")
+                else:
+                    logger.info(f"Admin user already exists: {Config.ADMIN_USERNAME}")
             else:
                 logger.info(f"Admin user already exists: {Config.ADMIN_USERNAME}")
+            
+            session.merge(AppState(key=BOOTSTRAP_DONE_KEY, value=Config.ADMIN_USERNAME))
+            session.commit()
+            _bootstrap_checked = True
         except Exception as e:
             if session:
                 session.rollback()
@@ -404,11 +503,34 @@ def create_default_admin():
             except Exception as close_error:
                 logger.error(f"Error closing session: {str(close_error)}")
 
+def insert_user(session, username, password_hash):
+    """
+    Insert a user in one statement, doing nothing if the username is taken.
+    
+    Returns:
+        bool: True if the user was inserted (the caller commits)
+    """
+    dialect = session.get_bind().dialect.name
+    if dialect == 'sqlite':
+        stmt = sqlite_insert(User.__table__)
+    elif dialect == 'postgresql':
+        stmt = postgresql_insert(User.__table__)
+    else:
+        if session.query(User.id).filter_by(username=username).scalar():
+            return False
+        session.add(User(username=username, password_hash=password_hash))
+        return True
+    
+    stmt = stmt.values(username=username, password_hash=password_hash).on_conflict_do_nothing(
+        index_elements=['username']
+    )
+    return session.execute(stmt).rowcount == 1
+
 def validate_database_connection():
     """Validate database connection and return True if successful"""
     try:
         session = Session()
-        session.execute("SELECT 1")
+        session.execute(text("SELECT 1"))
         session.close()
         return True
     except Exception as e:
@@ -416,49 +538,59 @@ def validate_database_connection():
         return False
 
 def get_session():
-    """Get a new database session"""
+    """Get the current thread's database session"""
     return Session()
 
+# AppState keys read by get_app_credentials
+CREDENTIAL_KEYS = (
+    'acgi_username', 'acgi_password', 'acgi_environment',
+    'hubspot_api_key', 'hubspot_api_key_contacts', 'hubspot_api_key_memberships',
+    'hubspot_api_key_orders', 'hubspot_api_key_events',
+)
+
+# Complete credentials from get_app_credentials, reused for CREDENTIALS_CACHE_TTL seconds.
+# save_credentials clears them; other processes see changes once their copy expires.
+CREDENTIALS_CACHE_TTL = 60
+_credentials_cache = None  # (expires_at, credentials)
+
+def clear_credentials_cache():
+    """Drop this process's cached credentials (after they change)"""
+    global _credentials_cache
+    _credentials_cache = None
+
 def get_app_credentials():
-    """Get application credentials from AppState"""
-    session = get_session()
+    """Get application credentials from AppState (complete credentials are cached briefly)"""
+    global _credentials_cache
+    cached = _credentials_cache
+    if cached is not None and cached[0] > time.monotonic():
+        return dict(cached[1])
+    
     try:
-        # Get ACGI credentials
-        acgi_username = session.query(AppState).filter_by(key='acgi_username').first()
-        acgi_password = session.query(AppState).filter_by(key='acgi_password').first()
-        acgi_environment = session.query(AppState).filter_by(key='acgi_environment').first()
-        
-        # Get HubSpot API keys for different object types
-        hubspot_api_key = session.query(AppState).filter_by(key='hubspot_api_key').first()
-        hubspot_api_key_contacts = session.query(AppState).filter_by(key='hubspot_api_key_contacts').first()
-        hubspot_api_key_memberships = session.query(AppState).filter_by(key='hubspot_api_key_memberships').first()
-        hubspot_api_key_orders = session.query(AppState).filter_by(key='hubspot_api_key_orders').first()
-        hubspot_api_key_events = session.query(AppState).filter_by(key='hubspot_api_key_events').first()
+        with session_scope() as session:
+            # All credential rows in one query
+            stored = dict(session.query(AppState.key, AppState.value).filter(AppState.key.in_(CREDENTIAL_KEYS)))
         
-        if not all([acgi_username, acgi_password]):
+        if 'acgi_username' not in stored or 'acgi_password' not in stored:
             return None
         
         # Use specific API keys if available, fallback to general one
+        hubspot_api_key = stored.get('hubspot_api_key')
         credentials = {
-            'acgi_username': acgi_username.value,
-            'acgi_password': acgi_password.value,
-            'acgi_environment': acgi_environment.value if acgi_environment else 'test',
-            'hubspot_api_key': hubspot_api_key.value if hubspot_api_key else None,
-            'hubspot_api_key_contacts': hubspot_api_key_contacts.value if hubspot_api_key_contacts else hubspot_api_key.value if hubspot_api_key else None,
-            'hubspot_api_key_memberships': hubspot_api_key_memberships.value if hubspot_api_key_memberships else hubspot_api_key.value if hubspot_api_key else None,
-            'hubspot_api_key_orders': hubspot_api_key_orders.value if hubspot_api_key_orders else hubspot_api_key.value if hubspot_api_key else None,
-            'hubspot_api_key_events': hubspot_api_key_events.value if hubspot_api_key_events else hubspot_api_key.value if hubspot_api_key else None
+            'acgi_username': stored['acgi_username'],
+            'acgi_password': stored['acgi_password'],
+            'acgi_environment': stored.get('acgi_environment', 'test'),
+            'hubspot_api_key': hubspot_api_key,
         }
+        for object_type in ('contacts', 'memberships', 'orders', 'events'):
+            key = f'hubspot_api_key_{object_type}'
+            credentials[key] = stored[key] if key in stored else hubspot_api_key
         
         # Ensure at least one HubSpot API key is available
-        if not any([credentials['hubspot_api_key'], credentials['hubspot_api_key_contacts'], 
-                   credentials['hubspot_api_key_memberships'], credentials['hubspot_api_key_orders'], 
-                   credentials['hubspot_api_key_events']]):
+        if not any(value for key, value in credentials.items() if key.startswith('hubspot_api_key')):
             return None
-            
-        return credentials
+        
+        _credentials_cache = (time.monotonic() + CREDENTIALS_CACHE_TTL, credentials)
+        return dict(credentials)
     except Exception as e:
         logger.error(f"Error getting app credentials: {str(e)}")
         return None
-    finally:
-        session.close() 
\ No newline at end of file
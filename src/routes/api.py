@@ -4,7 +4,7 @@ from models import get_session, FormField, SearchPreference
 from services.hubspot_client import HubSpotClient
 from routes.auth import login_required
 from src.services.acgi_client import ACGIClient
-from src.models import  ContactFieldMapping, AppState, MembershipFieldMapping, EventFieldMapping, PurchasedProductsFieldMapping
+from models import ContactFieldMapping, AppState, MembershipFieldMapping, EventFieldMapping, PurchasedProductsFieldMapping
 
 logger = setup_logging()
 hubspot_client = HubSpotClient()
@@ -626,7 +626,7 @@ def init_api_routes(app):
         session = get_session()
         try:
             key = f'acgi_field_config_{object_type}'
-            from src.models import AppState
+            from models import AppState
             obj = session.query(AppState).filter_by(key=key).first()
             import json
             if not obj:
@@ -651,7 +651,7 @@ def init_api_routes(app):
         session = get_session()
         try:
             key = f'acgi_field_config_{object_type}'
-            from src.models import AppState
+            from models import AppState
             obj = session.query(AppState).filter_by(key=key).first()
             import json
             config = json.loads(obj.value) if obj and obj.value else {}
@@ -672,7 +672,7 @@ def init_api_routes(app):
         session = get_session()
         try:
             key = f'acgi_fields_{object_type}'
-            from src.models import AppState
+            from models import AppState
             obj = session.query(AppState).filter_by(key=key).first()
             import json
             if not obj:
@@ -697,7 +697,7 @@ def init_api_routes(app):
         session = get_session()
         try:
             key = f'acgi_fields_{object_type}'
-            from src.models import AppState
+            from models import AppState
             obj = session.query(AppState).filter_by(key=key).first()
             import json
             fields = json.loads(obj.value) if obj and obj.value else {}
@@ -718,7 +718,7 @@ def init_api_routes(app):
         session = get_session()
         try:
             key = f'acgi_address_preference_{object_type}'
-            from src.models import AppState
+            from models import AppState
             obj = session.query(AppState).filter_by(key=key).first()
             import json
             if not obj:
@@ -743,7 +743,7 @@ def init_api_routes(app):
         session = get_session()
         try:
             key = f'acgi_address_preference_{object_type}'
-            from src.models import AppState
+            from models import AppState
             obj = session.query(AppState).filter_by(key=key).first()
             import json
             preference = json.loads(obj.value) if obj and obj.value else {}
@@ -764,7 +764,7 @@ def init_api_routes(app):
         session = get_session()
         try:
             key = f'acgi_email_preference_{object_type}'
-            from src.models import AppState
+            from models import AppState
             obj = session.query(AppState).filter_by(key=key).first()
             import json
             if not obj:
@@ -789,7 +789,7 @@ def init_api_routes(app):
         session = get_session()
         try:
             key = f'acgi_email_preference_{object_type}'
-            from src.models import AppState
+            from models import AppState
             obj = session.query(AppState).filter_by(key=key).first()
             import json
             preference = json.loads(obj.value) if obj and obj.value else {}
@@ -810,7 +810,7 @@ def init_api_routes(app):
         session = get_session()
         try:
             key = f'acgi_phone_preference_{object_type}'
-            from src.models import AppState
+            from models import AppState
             obj = session.query(AppState).filter_by(key=key).first()
             import json
             if not obj:
@@ -835,7 +835,7 @@ def init_api_routes(app):
         session = get_session()
         try:
             key = f'acgi_phone_preference_{object_type}'
-            from src.models import AppState
+            from models import AppState
             obj = session.query(AppState).filter_by(key=key).first()
             import json
             preference = json.loads(obj.value) if obj and obj.value else {}
@@ -911,7 +911,7 @@ def init_api_routes(app):
                 return jsonify({'success': False, 'error': str(e)}), 500
         else:
             try:
-                from src.models import SchedulingConfig
+                from models import SchedulingConfig
                 config = SchedulingConfig.get_config()
                 return jsonify({'success': True, 'config': config})
             except Exception as e:
@@ -924,7 +924,7 @@ def init_api_routes(app):
         """Get scheduling status information"""
         try:
             from src.services.scheduler_service import scheduler_service
-            from src.models import SchedulingConfig
+            from models import SchedulingConfig
             
             # Get raw config for debugging
             raw_config = SchedulingConfig.get_config()
@@ -966,7 +966,7 @@ def init_api_routes(app):
         """Stop synchronization (disable scheduling)"""
         try:
             from src.services.scheduler_service import scheduler_service
-            from src.models import SchedulingConfig
+            from models import SchedulingConfig
             
             # Get current config and disable it
             current_config = SchedulingConfig.get_config()
@@ -990,7 +990,7 @@ def init_api_routes(app):
         """Test endpoint to debug scheduling configuration"""
         try:
             from src.services.scheduler_service import scheduler_service
-            from src.models import SchedulingConfig
+            from models import SchedulingConfig
             
             # Get raw config
             config = SchedulingConfig.get_config()
@@ -14,9 +14,8 @@ integration_service = IntegrationService()
 acgi_client = ACGIClient()
 hubspot_client = HubSpotClient()
 
-# Initialize scheduler
+# Initialize scheduler (its thread starts with the first scheduled job, see /start-scheduler)
 scheduler = BackgroundScheduler()
-scheduler.start()
 
 main_bp = Blueprint('main', __name__)
 
@@ -196,6 +195,9 @@ def init_routes(app):
             except:
                 pass
             
+            if not scheduler.running:
+                scheduler.start()
+            
             # Add new scheduled job
             scheduler.add_job(
                 func=lambda: integration_service.run_integration(acgi_credentials, hubspot_credentials),
@@ -241,9 +243,10 @@ def init_routes(app):
         try:
             from datetime import datetime
             # Check database connection
-            from src.models import get_session
+            from sqlalchemy import text
+            from models import get_session
             session = get_session()
-            session.execute("SELECT 1")
+            session.execute(text("SELECT 1"))
             session.close()
             
             # Check scheduler status
@@ -11,13 +11,16 @@ logger = logging.getLogger(__name__)
 class ACGIClient:
     """Client for interacting with ACGI API"""
     
-    def __init__(self, cache_manager=None):
+    def __init__(self, cache_manager=None, session: Optional[requests.Session] = None):
         self.base_url = "https://ams.cfma.org"
-        self.session = requests.Session()
-        self.session.headers.update({
-            'Content-Type': 'application/x-www-form-urlencoded',
-            'User-Agent': 'ACGI-HubSpot-Integration/1.0'
-        })
+        # Callers may pass in their own (already configured) session to share its connection pool
+        if session is None:
+            session = requests.Session()
+            session.headers.update({
+                'Content-Type': 'application/x-www-form-urlencoded',
+                'User-Agent': 'ACGI-HubSpot-Integration/1.0'
+            })
+        self.session = session
         # Use provided cache manager or global events cache
         self.cache_manager = cache_manager or events_cache
     
@@ -5,7 +5,7 @@ from src.services.acgi_client import ACGIClient
 from datetime import datetime, timezone
 from src.services.hubspot_client import HubSpotClient
 from src.services.data_mapper import DataMapper
-from src.models import ContactFieldMapping, MembershipFieldMapping, get_app_credentials
+from models import ContactFieldMapping, MembershipFieldMapping, get_all_mappings, get_app_credentials
 logger = logging.getLogger(__name__)
 
 class IntegrationService:
@@ -89,12 +89,12 @@ class IntegrationService:
             if not self.hubspot_client.initialize_client(hubspot_api_key):
                 return {'success': False, 'error': 'Failed to initialize HubSpot client'}
             
-            # Get field mappings
-            contact_mapping = ContactFieldMapping.get_mapping()
-            membership_mapping = MembershipFieldMapping.get_mapping()
-            from src.models import PurchasedProductsFieldMapping, EventFieldMapping
-            orders_mapping = PurchasedProductsFieldMapping.get_mapping()
-            events_mapping = EventFieldMapping.get_mapping()
+            # Get field mappings (all object types in one read)
+            mappings = get_all_mappings()
+            contact_mapping = mappings['contacts']
+            membership_mapping = mappings['memberships']
+            orders_mapping = mappings['purchased_products']
+            events_mapping = mappings['events']
             print("MEMBERSHIP MAPPING 2",membership_mapping)
             print("ORDERS MAPPING 2",orders_mapping)
             print("EVENTS MAPPING 2",events_mapping)
@@ -217,7 +217,7 @@ class IntegrationService:
             acgi_customer = acgi_result['customers'][0]
             
             # Get search preference for contacts
-            from src.models import SearchPreference, get_session
+            from models import SearchPreference, get_session
             session = get_session()
             try:
                 search_pref = session.query(SearchPreference).filter_by(object_type='contacts').first()
@@ -295,7 +295,7 @@ class IntegrationService:
         hubspot_contact = {}
         
         # Get ACGI preferences for selecting best data
-        from src.models import AppState, get_session
+        from models import AppState, get_session
         session = get_session()
         try:
             # Get email preference
@@ -822,7 +822,7 @@ class IntegrationService:
                 return {'success': False, 'error': 'Failed to initialize HubSpot client for orders'}
             
             # Get field mappings
-            from src.models import PurchasedProductsFieldMapping
+            from models import PurchasedProductsFieldMapping
             orders_mapping = PurchasedProductsFieldMapping.get_mapping()
             
             # Prepare ACGI credentials
@@ -888,7 +888,7 @@ class IntegrationService:
                 return {'success': False, 'error': 'Failed to initialize HubSpot client for events'}
             
             # Get field mappings
-            from src.models import EventFieldMapping
+            from models import EventFieldMapping
             events_mapping = EventFieldMapping.get_mapping()
 
             print( "events_mapping", events_mapping)
@@ -1,7 +1,7 @@
 import logging
 from apscheduler.schedulers.background import BackgroundScheduler
 from apscheduler.triggers.interval import IntervalTrigger
-from src.models import SchedulingConfig
+from models import SchedulingConfig
 from src.services.integration_service import IntegrationService
 import threading
 import time
@@ -154,7 +154,7 @@ class SchedulerService:
                 logger.info("Production mode enabled - fetching queued customers from ACGI")
                 print("Production mode enabled - fetching queued customers from ACGI")
                 # Get queued customers from ACGI
-                from src.models import get_app_credentials
+                from models import get_app_credentials
                 creds = get_app_credentials()
                 if not creds:
                     return {'success': False, 'error': 'ACGI credentials not set'}
@@ -491,7 +491,7 @@ class SchedulerService:
             logger.info(f"=== PURGE QUEUE JOB STARTED at {current_time} ===")
             
             # Get credentials
-            from src.models import get_app_credentials
+            from models import get_app_credentials
             creds = get_app_credentials()
             if not creds:
                 logger.error("ACGI credentials not set for purge job")
@@ -1,5 +1,5 @@
 import logging
-from models import get_session, AppState
+from models import get_session, clear_credentials_cache, AppState
 
 logger = logging.getLogger(__name__)
 
@@ -44,6 +44,7 @@ def save_credentials(credentials_dict):
                     else:
                         session.add(AppState(key=key, value=value))
             session.commit()
+            clear_credentials_cache()
             logger.info("Credentials saved successfully")
             return True
         except Exception as e:
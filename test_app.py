@@ -7,6 +7,8 @@ import os
 
 # Add the current directory to Python path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+# The app imports its modules (models, config) from src, as wsgi.py sets up
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src'))
 
 def test_imports():
     """Test if all required modules can be imported"""
@@ -23,11 +25,11 @@ def test_imports():
         return False
     
     try:
-        print("  Testing src.models...")
-        from src.models import init_db, create_default_admin
-        print("  ✅ src.models imported successfully")
+        print("  Testing models...")
+        from models import init_db, create_default_admin
+        print("  ✅ models imported successfully")
     except Exception as e:
-        print(f"  ❌ src.models import failed: {e}")
+        print(f"  ❌ models import failed: {e}")
         import traceback
         traceback.print_exc()
         return False
@@ -49,7 +51,7 @@ def test_database():
     print("🗄️ Testing database...")
     
     try:
-        from src.models import init_db, create_default_admin
+        from models import init_db, create_default_admin
         init_db()
         print("  ✅ Database initialized successfully")
         return True
@@ -59,6 +61,28 @@ def test_database():
         traceback.print_exc()
         return False
 
+def test_default_admin():
+    """Test that database initialization reaches the default admin bootstrap"""
+    print("👤 Testing default admin...")
+    
+    try:
+        from config import Config
+        from models import AppState, User, BOOTSTRAP_DONE_KEY, init_db, session_scope, validate_database_connection
+        
+        assert validate_database_connection(), "database connection check failed"
+        init_db()
+        with session_scope() as session:
+            assert session.query(User.id).filter_by(username=Config.ADMIN_USERNAME).scalar(), "admin user missing"
+            assert session.query(AppState.value).filter_by(key=BOOTSTRAP_DONE_KEY).scalar() == Config.ADMIN_USERNAME, \
+                "bootstrap marker missing"
+        print("  ✅ Default admin user present")
+        return True
+    except Exception as e:
+        print(f"  ❌ Default admin check failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
 def test_app_creation():
     """Test if the Flask app can be created"""
     print("🚀 Testing app creation...")
@@ -90,6 +114,11 @@ def main():
         print("❌ Database tests failed")
         return 1
     
+    # Test default admin bootstrap
+    if not test_default_admin():
+        print("❌ Default admin tests failed")
+        return 1
+    
     # Test app creation
     if not test_app_creation():
         print("❌ App creation tests failed")